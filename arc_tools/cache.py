@@ -0,0 +1,134 @@
+from collections import Counter, OrderedDict
+from enum import Enum
+from functools import wraps
+from typing import NamedTuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class _LRUCache:
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+_cache: _LRUCache | None = None
+
+# stored in place of a result that was the grid the analysis ran on
+_SAME_GRID = object()
+
+
+def enable_cache(maxsize: int = 1024):
+    """
+    Memoize the pure grid analyses (detect_objects, get_holes_count, get_values_count, shrink, is_similar),
+    keyed on grid content and arguments. Results are copied in and out, so editing them never reaches the cache.
+    """
+    global _cache
+    _cache = _LRUCache(maxsize)
+
+
+def disable_cache():
+    global _cache
+    _cache = None
+
+
+def clear_cache():
+    if _cache is not None:
+        _cache.entries.clear()
+
+
+def cache_info() -> CacheInfo:
+    if _cache is None:
+        return CacheInfo(0, 0, 0, 0, 0)
+    return CacheInfo(_cache.hits, _cache.misses, _cache.evictions, _cache.maxsize, len(_cache.entries))
+
+
+def _key(value):
+    if hasattr(value, '_content_key'):
+        return value._content_key()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (list, tuple)):
+        return tuple(_key(item) for item in value)
+    hash(value)
+    return value
+
+
+def _store(result, grid):
+    """Copy of result that the caller can no longer reach."""
+    from arc_tools.grid import Grid, SubGrid
+    if result is grid:
+        return _SAME_GRID
+    if isinstance(result, SubGrid):
+        return result.copy(), result._parent is grid
+    if isinstance(result, Grid):
+        return result.copy()
+    if isinstance(result, Counter):
+        return Counter(result)
+    if isinstance(result, list):
+        return [_store(item, grid) for item in result]
+    return result
+
+
+def _load(stored, grid):
+    """Fresh copy of a stored result, with objects found on the analysed grid bound to the caller's grid."""
+    from arc_tools.grid import Grid
+    if stored is _SAME_GRID:
+        return grid
+    if isinstance(stored, tuple) and len(stored) == 2 and isinstance(stored[0], Grid):
+        obj, on_grid = stored
+        obj = obj.copy()
+        if on_grid:
+            obj._rebind(grid)
+        return obj
+    if isinstance(stored, Grid):
+        return stored.copy()
+    if isinstance(stored, Counter):
+        return Counter(stored)
+    if isinstance(stored, list):
+        return [_load(item, grid) for item in stored]
+    return stored
+
+
+def memoize(function):
+    """Serve repeated calls on grids of equal content from the cache enabled with enable_cache."""
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        cache = _cache
+        if cache is None:
+            return function(*args, **kwargs)
+        try:
+            key = (function.__qualname__, _key(args), tuple(sorted((name, _key(value)) for name, value in kwargs.items())))
+            hash(key)
+        except (TypeError, ValueError):
+            return function(*args, **kwargs)
+        grid = args[0]
+        entry = cache.get(key)
+        if entry is not None:
+            return _load(entry[0], grid)
+        result = function(*args, **kwargs)
+        cache.put(key, (_store(result, grid),))
+        return result
+    return wrapper
@@ -0,0 +1,129 @@
+from collections import deque
+import numpy as np
+
+from arc_tools.constants import CARDINAL_DIRECTIONS, EIGHT_DIRECTIONS
+
+
+class Components:
+    """
+    Connected components of a grid mask.
+    labels[y, x] is the index of the component holding the cell, -1 outside the mask.
+    Components are indexed in row-major order of their first cell; boxes rows are (x1, y1, x2, y2) and extremes
+    rows hold the (x, y) of the left, right, top and bottom extreme cells, ties going to the top then the left.
+    enclosing is only set on holes (see Grid.get_holes).
+    """
+    enclosing: np.ndarray | None = None
+
+    def __init__(self, labels: np.ndarray, values: np.ndarray, boxes: np.ndarray, extremes: np.ndarray, sizes: np.ndarray, colors: np.ndarray, go_diagonal: bool):
+        for array in (labels, values, boxes, extremes, sizes, colors):
+            array.flags.writeable = False
+        self.labels = labels
+        self.values = values
+        self.boxes = boxes
+        self.extremes = extremes
+        self.sizes = sizes
+        self.colors = colors
+        self.go_diagonal = go_diagonal
+        self.count = len(sizes)
+
+    def __len__(self):
+        return self.count
+
+    def __repr__(self):
+        return f"Components(count={self.count})"
+
+    def mask(self, index: int) -> np.ndarray:
+        """Cells of the component, cropped to its box."""
+        x1, y1, x2, y2 = self.boxes[index].tolist()
+        return self.labels[y1:y2 + 1, x1:x2 + 1] == index
+
+    def cells(self, index: int, start: tuple[int, int] | None = None) -> list[tuple[int, int, int]]:
+        """(x, y, value) of the component's cells in the order a breadth-first flood fill from start (default its first cell) visits them."""
+        x1, y1, x2, y2 = self.boxes[index].tolist()
+        inside = self.mask(index).tolist()
+        values = self.values[y1:y2 + 1, x1:x2 + 1].tolist()
+        height, width = len(inside), len(inside[0])
+        directions = EIGHT_DIRECTIONS if self.go_diagonal else CARDINAL_DIRECTIONS
+        start = (0, inside[0].index(True)) if start is None else (start[1] - y1, start[0] - x1)
+        inside[start[0]][start[1]] = False
+        cells = []
+        queue = deque([start])
+        while queue:
+            row, col = queue.popleft()
+            cells.append((col + x1, row + y1, values[row][col]))
+            for dr, dc in directions:
+                nr, nc = row + dr, col + dc
+                if 0 <= nr < height and 0 <= nc < width and inside[nr][nc]:
+                    inside[nr][nc] = False
+                    queue.append((nr, nc))
+        return cells
+
+    def select(self, keep: np.ndarray) -> 'Components':
+        """The components where keep is True, re-indexed in the same order."""
+        keep = np.asarray(keep, dtype=bool)
+        lookup = np.full(self.count + 1, -1, dtype=np.int32)
+        lookup[:-1][keep] = np.arange(int(keep.sum()), dtype=np.int32)
+        return Components(lookup[self.labels], self.values, self.boxes[keep], self.extremes[keep], self.sizes[keep], self.colors[keep], self.go_diagonal)
+
+
+def label_components(values: np.ndarray, mask: np.ndarray, go_diagonal: bool = True, single_color_only: bool = False) -> Components:
+    """
+    Label the connected cells of mask with a vectorized union-find: neighbouring cells are hooked to the smaller
+    root and the parent array is compressed by pointer jumping until no edge joins two components.
+    With single_color_only, neighbours only connect when their values are equal.
+    """
+    height, width = mask.shape
+    size = height * width
+    parent = np.arange(size, dtype=np.int32)
+    index = parent.reshape(height, width)
+    offsets = [(0, 1), (1, 0), (1, 1), (1, -1)] if go_diagonal else [(0, 1), (1, 0)]
+    sources, targets = [], []
+    for dy, dx in offsets:
+        source = (slice(0, height - dy), slice(max(-dx, 0), width - max(dx, 0)))
+        target = (slice(dy, height), slice(max(dx, 0), width + min(dx, 0)))
+        linked = mask[source] & mask[target]
+        if single_color_only:
+            linked &= values[source] == values[target]
+        sources.append(index[source][linked])
+        targets.append(index[target][linked])
+    a, b = np.concatenate(sources), np.concatenate(targets)
+    while a.size:
+        root_a, root_b = parent[a], parent[b]
+        apart = root_a != root_b
+        if not apart.any():
+            break
+        a, b, root_a, root_b = a[apart], b[apart], root_a[apart], root_b[apart]
+        np.minimum.at(parent, np.maximum(root_a, root_b), np.minimum(root_a, root_b))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    flat_mask = mask.ravel()
+    # every component is rooted at its smallest, i.e. first row-major, cell
+    seeds = np.flatnonzero(flat_mask & (parent == np.arange(size)))
+    count = len(seeds)
+    lookup = np.full(size, -1, dtype=np.int32)
+    lookup[seeds] = np.arange(count, dtype=np.int32)
+    labels = np.where(flat_mask, lookup[parent], -1).astype(np.int32).reshape(height, width)
+
+    # one pass over the cells: each extreme is the min or max of a key ordering the cells by that side first
+    ys, xs = np.nonzero(mask)
+    owners = labels[ys, xs]
+    keys = np.empty((4, count), dtype=np.int64)
+    keys[0] = keys[2] = size
+    keys[1] = keys[3] = -1
+    np.minimum.at(keys[0], owners, xs * height + ys)
+    np.maximum.at(keys[1], owners, xs * height + (height - 1 - ys))
+    keys[2] = seeds
+    np.maximum.at(keys[3], owners, ys * width + (width - 1 - xs))
+    extremes = np.empty((count, 4, 2), dtype=np.int64)
+    extremes[:, 0] = np.stack([keys[0] // height, keys[0] % height], axis=1)
+    extremes[:, 1] = np.stack([keys[1] // height, height - 1 - keys[1] % height], axis=1)
+    extremes[:, 2] = np.stack([keys[2] % width, keys[2] // width], axis=1)
+    extremes[:, 3] = np.stack([width - 1 - keys[3] % width, keys[3] // width], axis=1)
+    boxes = np.stack([extremes[:, 0, 0], extremes[:, 2, 1], extremes[:, 1, 0], extremes[:, 3, 1]], axis=1)
+    sizes = np.bincount(owners, minlength=count)
+    colors = values.ravel()[seeds]
+    return Components(labels, np.array(values), boxes, extremes, sizes, colors, go_diagonal)
@@ -1,12 +1,19 @@
 
 
+import numpy as np
+
+from arc_tools.partition import uniform_lines
+
+
+def _values(grid) -> np.ndarray:
+    return grid.data.view(np.ndarray) if hasattr(grid, 'data') else np.array(grid)
+
+
 def extract_knowledge_vertically(grid):
-    # Find the column where all elements are 1
-    split_col = None
-    for col in range(len(grid[0])):  # Iterate over each column
-        if all(row[col] == 1 for row in grid):  # Check if all rows have 1 in this column
-            split_col = col
-            break
+    # Find the first column where all elements are 1
+    uniform, colors = uniform_lines(_values(grid), axis=1)
+    columns = np.flatnonzero(uniform & (colors == 1))
+    split_col = int(columns[0]) if len(columns) else None
 
     if split_col is not None:
         left_part = [row[:split_col] for row in grid]  # All columns before split_col
@@ -17,13 +24,11 @@ def extract_knowledge_vertically(grid):
             return left_part
 
 def extract_knowledge_horizontally(grid):
-    split_row = None
-    for i in range(len(grid)):
-        if all(grid[i][j] == 1 for j in range(len(grid[0]))):  # Check if row has at least one 1
-            # Check if this row is different from the previous pattern
-            if i > 0 and any(grid[i][j] != grid[i-1][j] for j in range(len(grid[0]))):
-                split_row = i
-                break
+    # First row of 1s below a row that is not all 1s
+    uniform, colors = uniform_lines(_values(grid), axis=0)
+    ones = uniform & (colors == 1)
+    rows = np.flatnonzero(ones[1:] & ~ones[:-1]) + 1
+    split_row = int(rows[0]) if len(rows) else None
     if split_row:
         top_part = grid[:split_row]
         bottom_part = grid[split_row+1:]
@@ -1,15 +1,21 @@
 from collections import Counter, deque
 from enum import Enum
 from itertools import product
+import hashlib
 import json
+import weakref
 import numpy as np
 from copy import deepcopy
-from typing import Optional
+from typing import NamedTuple, Optional
 from typing_extensions import override
 
+from arc_tools.cache import memoize
+from arc_tools.components import Components, label_components
 from arc_tools.constants import CARDINAL_DIRECTIONS, EIGHT_DIRECTIONS
-from arc_tools.logger import logger
-from arc_tools.plot import plot_grids
+from arc_tools.logger import logger, tracer
+from arc_tools.rays import Ray, cast_rays, segment_cells
+from arc_tools.rectangles import RectangleIndex
+from arc_tools.symmetry import Symmetry, symmetry_report
 
 class MyEnum(Enum):
     def __repr__(self):
@@ -54,6 +60,29 @@ class BorderSide(MyEnum):
     TOP = 'top'
     BOTTOM = 'bottom'
 
+class Transform(MyEnum):
+    """The eight symmetries of a rectangle (the dihedral group D4)."""
+    IDENTITY = 'identity'
+    ROTATE = 'rotate'  # 90 degrees clockwise
+    ROTATE_180 = 'rotate_180'
+    ANTI_ROTATE = 'anti_rotate'  # 90 degrees counter-clockwise
+    FLIP_HORIZONTALLY = 'flip_horizontally'  # rows in reverse order
+    FLIP_VERTICALLY = 'flip_vertically'  # columns in reverse order
+    TRANSPOSE = 'transpose'
+    ANTI_TRANSPOSE = 'anti_transpose'
+
+
+_TRANSFORMS = {
+    Transform.IDENTITY: lambda a: a,
+    Transform.ROTATE: lambda a: a[::-1].T,
+    Transform.ROTATE_180: lambda a: a[::-1, ::-1],
+    Transform.ANTI_ROTATE: lambda a: a[:, ::-1].T,
+    Transform.FLIP_HORIZONTALLY: lambda a: a[::-1],
+    Transform.FLIP_VERTICALLY: lambda a: a[:, ::-1],
+    Transform.TRANSPOSE: lambda a: a.T,
+    Transform.ANTI_TRANSPOSE: lambda a: a[::-1, ::-1].T,
+}
+
 class GridPoint:
     def __init__(self, x, y, value = None):
         self.x = x
@@ -67,6 +96,9 @@ class GridPoint:
     def __next__(self):
         return next(self.x, self.y)
     
+    def _content_key(self):
+        return (self.x, self.y)
+
     def __repr__(self):
         if self.value is None:
             return f"({self.x}, {self.y})"
@@ -100,10 +132,10 @@ class GridRegion:
     def __init__(self, points: list[GridPoint | tuple]):
         if isinstance(points[0], (tuple, list)):
             points = [GridPoint(*p) for p in points]
-        self.x1 = min(p.x for p in points)
-        self.x2 = max(p.x for p in points)
-        self.y1 = min(p.y for p in points)
-        self.y2 = max(p.y for p in points)
+        xs = [p.x for p in points]
+        ys = [p.y for p in points]
+        self.x1, self.x2 = min(xs), max(xs)
+        self.y1, self.y2 = min(ys), max(ys)
         self.width = self.x2 - self.x1 + 1
         self.height = self.y2 - self.y1 + 1
         self.start = GridPoint(self.x1, self.y1)
@@ -131,7 +163,7 @@ class GridRegion:
         elif isinstance(obj, GridRegion):
             return self.x1 <= obj.x1 <= self.x2 and self.y1 <= obj.y1 <= self.y2 and self.x1 <= obj.x2 <= self.x2 and self.y1 <= obj.y2 <= self.y2
         else:
-            logger.info(f'Unknown object type: {type(obj)}')
+            logger.info('Unknown object type: %s', type(obj))
         return False
     
     def get_surrounding_points(self, ignore_corner = False, only_edge_center = False):
@@ -161,62 +193,485 @@ class CustomIndexError(IndexError):
         super().__init__(self.message)
 
 class SafeList(list):
-    def __init__(self, grid: list[list[int]], allow_negative_index: bool = False):
+    allow_negative_index = False
+
+    def __init__(self, grid: list, allow_negative_index: bool = False):
         self.allow_negative_index = allow_negative_index
         super().__init__(grid)
 
     def __getitem__(self, index):
         try:
-            if type(index) != int or (0 <= index < len(self) or (self.allow_negative_index and index < 0)):
-                return super().__getitem__(index)
+            if type(index) is not int or 0 <= index < len(self) or (self.allow_negative_index and index < 0):
+                return list.__getitem__(self, index)
         except IndexError:
             # raise CustomIndexError(f"SafeList: Index {index} is out of bounds for list of length {len(self)}") from None
             pass
         return SafeList([])
-    
-    
+
+
     def __setitem__(self, index, value):
         try:
             return super().__setitem__(index, value)
         except IndexError:
             # raise CustomIndexError(f"SafeList assignment: Index {index} is out of bounds for list of length {len(self)}") from None
             pass
-    
-    
+
+
+def _reshapes_row(method):
+    """Wrap a list method that can resize or reorder a row; the owning grid rebuilds its cell array afterwards."""
+    def wrapper(self, *args, **kwargs):
+        grid = self._grid
+        if grid is not None:
+            grid._before_change()
+        result = method(self, *args, **kwargs)
+        if grid is not None:
+            grid._data = grid._colors = None
+            grid._version += 1
+        return result
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+def _reshapes_grid(method):
+    """Wrap a list method that can add, remove or reorder rows of a grid."""
+    def wrapper(self, *args, **kwargs):
+        self._before_change()
+        result = method(self, *args, **kwargs)
+        self._sync_rows()
+        return result
+    wrapper.__name__ = method.__name__
+    return wrapper
+
+
+class GridRow(SafeList):
+    """
+    A row of a Grid.
+    Cell writes are mirrored into the owning grid's cell array, so `grid[y][x] = value` stays O(1).
+    """
+    _grid: Optional['Grid'] = None
+    _y = 0
+
+    def __setitem__(self, index, value):
+        grid = self._grid
+        if grid is not None and (grid._background_color is None or grid._views or grid._frozen is not None):
+            grid._before_change()
+        y = self._y
+        if grid is not None and type(index) is int and 0 <= index < len(self) and y < len(grid) and list.__getitem__(grid, y) is self:
+            old = list.__getitem__(self, index)
+            list.__setitem__(self, index, value)
+            if type(old) is not type(value) or old != value:
+                grid._cell_written(y, index, old, value)
+            return
+        try:
+            list.__setitem__(self, index, value)
+        except IndexError:
+            return
+        if grid is not None:
+            grid._colors = grid._data = None
+            grid._version += 1
+
+    append = _reshapes_row(list.append)
+    extend = _reshapes_row(list.extend)
+    insert = _reshapes_row(list.insert)
+    pop = _reshapes_row(list.pop)
+    remove = _reshapes_row(list.remove)
+    clear = _reshapes_row(list.clear)
+    sort = _reshapes_row(list.sort)
+    reverse = _reshapes_row(list.reverse)
+    __delitem__ = _reshapes_row(list.__delitem__)
+    __iadd__ = _reshapes_row(list.__iadd__)
+    __imul__ = _reshapes_row(list.__imul__)
+
+
+class GridArray(np.ndarray):
+    """
+    Cell array of a Grid, indexed as [y, x].
+    Writes made through it, its views or in-place operators are copied back into the grid's rows.
+    """
+    _grid: Optional['Grid'] = None
+
+    @classmethod
+    def bind(cls, values: np.ndarray, grid: 'Grid') -> 'GridArray':
+        """Copy values into a new cell array owned by grid."""
+        data = cls(values.shape, values.dtype)
+        np.ndarray.__setitem__(data, Ellipsis, values)
+        data._grid = grid
+        return data
+
+    def __setitem__(self, index, value):
+        grid = self._owner()
+        if grid is not None:
+            grid._before_change()
+            if not self._fits(value):
+                self._write_wide(grid, index, value)
+                return
+        super().__setitem__(index, value)
+        if grid is not None:
+            self._written(grid, index)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, out=None, **kwargs):
+        inputs = tuple(x.view(np.ndarray) if isinstance(x, GridArray) else x for x in inputs)
+        if out is None:
+            return getattr(ufunc, method)(*inputs, **kwargs)
+        grids = [x._owner() if isinstance(x, GridArray) else None for x in out]
+        for grid in grids:
+            if grid is not None:
+                grid._before_change()
+        kwargs['out'] = tuple(x.view(np.ndarray) if isinstance(x, GridArray) else x for x in out)
+        getattr(ufunc, method)(*inputs, **kwargs)
+        for x, grid in zip(out, grids):
+            if grid is not None:
+                x._written(grid)
+        return out[0] if len(out) == 1 else out
+
+    def _owner(self) -> Optional['Grid']:
+        root = self if self.base is None else self.base
+        grid = getattr(root, '_grid', None)
+        if grid is None or grid._data is not root:
+            return None
+        return grid
+
+    def _fits(self, value) -> bool:
+        """Whether value can be written to an integer cell array without overflowing or being truncated."""
+        if self.dtype.kind not in 'iu':
+            return True
+        values = np.asarray(value)
+        if values.dtype.kind == 'b' or not values.size:
+            return True
+        if values.dtype.kind not in 'iu':
+            return False
+        info = np.iinfo(self.dtype)
+        return info.min <= values.min() and values.max() <= info.max
+
+    def _write_wide(self, grid: 'Grid', index, value):
+        """
+        Make a write that does not fit the dtype on a wider copy of the cells, as `grid[y][x] = value` widens the
+        array it rebuilds. The copy becomes the grid's cell array; this array and its views no longer write through.
+        """
+        root = self if self.base is None else self.base
+        wide = root.view(np.ndarray).astype(np.result_type(root.dtype, np.asarray(value).dtype))
+        # the same view of the copy: same element offset and strides, as the root is C-contiguous
+        step = root.itemsize
+        start = (self.__array_interface__['data'][0] - root.__array_interface__['data'][0]) // step
+        target = np.lib.stride_tricks.as_strided(wide.reshape(-1)[start:], self.shape, tuple(stride // step * wide.itemsize for stride in self.strides))
+        target[index] = value
+        data = grid._data = GridArray.bind(wide, grid)
+        data._written(grid)
+
+    def _written(self, grid: 'Grid', index=None):
+        if self.base is None and type(index) is tuple and len(index) == 2 and all(isinstance(i, (int, np.integer)) for i in index):
+            y, x = index
+            row = list.__getitem__(grid, y)
+            if len(row) == self.shape[1]:
+                old, value = list.__getitem__(row, x), self.item(y, x)
+                list.__setitem__(row, x, value)
+                grid._colors = None
+                grid._version += 1
+                if grid._histogram is not None and x >= 0:
+                    grid._count_written(y, int(x), old, value)
+                return
+        grid._pull_rows()
+        grid._colors = None
+        grid._version += 1
+
+
 
 class Grid(SafeList):
+    # bumped by every change to the cells or the background; caches store the version they were computed at
+    _version = 0
+    _hash: tuple[int, int] | None = None
+    _key: tuple[int, tuple] | None = None
+    # (version, cell array the views were taken of, view per transform)
+    _transforms: tuple[int, np.ndarray, dict[Transform, np.ndarray]] | None = None
+    _similarity_keys: tuple[int, dict[tuple[bool, bool], tuple]] | None = None
+    # (version, count per value, (y, x) of its first cell in row-major order)
+    _histogram: tuple[int, dict[int, int], dict[int, tuple[int, int]]] | None = None
+    _holes: tuple[int, Components] | None = None
+    _rectangles: tuple[int, RectangleIndex] | None = None
+    # (version, shortest paths and distance maps by their arguments), see arc_tools.pathfinding
+    _paths: tuple[int, dict] | None = None
+    # per-version caches; copies must not share them, since their versions count on from the same number
+    _CACHES = ('_hash', '_key', '_transforms', '_similarity_keys', '_histogram', '_holes', '_rectangles', '_paths')
+    _data: GridArray | None = None
+    _background_color: int | None = None
+    _colors: tuple[int, ...] | None = None
+    _color: int | None = None
+    _center: GridPoint | None = None
+    _all_points: list[GridPoint] | None = None
+    _views: list[weakref.ref] | None = None
+    _frozen: np.ndarray | None = None
+
     def __init__(self, grid: list[list[int]], background_color: int | None = None, allow_negative_index: bool = False, region: GridRegion | None = None):
         if type(grid) == Grid:
             raise ValueError(f"Wrong input type: {type(grid)}")
-        grid = [SafeList(row, allow_negative_index) for row in grid]
-        super().__init__(grid, allow_negative_index)
-        if background_color is None:
-            background_color = self.detect_background_color()
-        self.background_color = background_color
+        if isinstance(grid, np.ndarray):
+            grid = grid.tolist()
+        rows = [GridRow(row, allow_negative_index) for row in grid]
+        super().__init__(rows, allow_negative_index)
+        for y, row in enumerate(rows):
+            row._grid = self
+            row._y = y
+        # background_color, colors, color, center and all_points are derived on first access
+        self._background_color = background_color
         self.height = self.h = len(self)
         self.width = self.w = len(self[0])
         self.shape = (self.width, self.height)
         self.region = region or GridRegion([GridPoint(0, 0), GridPoint(self.width - 1, self.height - 1)])
         self.cx = self.region.x1 + self.region.width // 2
         self.cy = self.region.y1 + self.region.height // 2
-        self.center = GridPoint(self.cx, self.cy)
-        self.colors = self.get_unique_values()
-        self.all_points = [GridPoint(x, y) for y, x in product(range(self.region.start.y, self.region.end.y + 1), range(self.region.start.x, self.region.end.x + 1))]
-        if getattr(self, 'color', None) is None:
-            if len(self.colors) == 1:
-                self.color = self.colors[0]
+
+    @property
+    def background_color(self) -> int:
+        if self._background_color is None:
+            self._background_color = self.detect_background_color()
+        return self._background_color
+
+    @background_color.setter
+    def background_color(self, value: int):
+        self._background_color = value
+        self._colors = None
+        self._version += 1
+
+    def _before_change(self):
+        """
+        Capture what must not see the coming mutation: the background is detected on the grid as constructed,
+        and SubGrid views still reading from this grid take their snapshot.
+        """
+        if self._background_color is None:
+            self._background_color = self.detect_background_color()
+        self._frozen = None
+        views = self._views
+        if views:
+            self._views = None
+            for ref in views:
+                view = ref()
+                if view is not None:
+                    view._detach()
+
+    def _freeze(self) -> np.ndarray:
+        """Read-only copy of the cells, shared by every SubGrid copy taken until the grid next changes."""
+        if self._frozen is None:
+            frozen = self.data.view(np.ndarray).copy()
+            frozen.flags.writeable = False
+            self._frozen = frozen
+        return self._frozen
+
+    def _add_view(self, view: 'SubGrid'):
+        views = self._views
+        if views is None:
+            views = self._views = []
+        views.append(weakref.ref(view))
+        if len(views) % 64 == 0:
+            views[:] = [ref for ref in views if ref() is not None]
+
+    @property
+    def colors(self) -> tuple[int, ...]:
+        if self._colors is None:
+            self._colors = self.get_unique_values()
+        return self._colors
+
+    @colors.setter
+    def colors(self, value: tuple[int, ...]):
+        self._colors = value
+
+    @property
+    def color(self) -> int | None:
+        """The given object color, else the only foreground color (None if there are several)."""
+        if self._color is not None:
+            return self._color
+        colors = self.colors
+        return colors[0] if len(colors) == 1 else None
+
+    @color.setter
+    def color(self, value: int | None):
+        self._color = value
+
+    @property
+    def center(self) -> GridPoint:
+        if self._center is None:
+            self._center = GridPoint(self.cx, self.cy)
+        return self._center
+
+    @center.setter
+    def center(self, value: GridPoint):
+        self._center = value
+
+    @property
+    def all_points(self) -> list[GridPoint]:
+        if self._all_points is None:
+            self._all_points = [GridPoint(x, y) for y, x in product(range(self.region.start.y, self.region.end.y + 1), range(self.region.start.x, self.region.end.x + 1))]
+        return self._all_points
+
+    @all_points.setter
+    def all_points(self, value: list[GridPoint]):
+        self._all_points = value
+
+    @property
+    def data(self) -> GridArray:
+        """
+        Cells as one contiguous ndarray indexed as [y, x] (int8 whenever the values fit, an object array for ragged
+        rows or cells that are not numbers). Built on first use and kept in sync with `grid[y][x] = value` writes;
+        writes through it update the grid, and a value the dtype cannot hold moves the grid to a wider array
+        either way.
+        """
+        data = self._data
+        if data is None:
+            data = self._data = self._build_data()
+        return data
+
+    @data.setter
+    def data(self, value):
+        if value is self._data:
+            return
+        value = np.asarray(value)
+        if value.shape != self.data.shape:
+            raise ValueError(f"Shape mismatch: Expected: {self.data.shape}, Actual: {value.shape}")
+        self.data[...] = value
+
+    def _build_data(self) -> GridArray:
+        rows = list(self)
+        width = max(map(len, rows), default=0)
+        values: np.ndarray | None = None
+        if all(len(row) == width for row in rows):
+            try:
+                values = np.array(rows)
+            except ValueError:
+                pass
+        if values is None or values.ndim > 2:
+            # ragged rows, or cells that are not numbers like the [] read past a SubGrid's parent: one object per
+            # cell as grid[y][x] reads it, so the end of a short row reads [] here too
+            values = np.empty((len(rows), width), dtype=object)
+            for y, row in enumerate(rows):
+                for x in range(width):
+                    values[y, x] = row[x]
+        elif values.ndim != 2:
+            values = values.reshape(len(rows), width)
+        if values.dtype.kind in 'biu' and (values.size == 0 or (-128 <= values.min() and values.max() <= 127)):
+            values = values.astype(np.int8)
+        return GridArray.bind(values, self)
+
+    def _cell_written(self, y: int, x: int, old, value):
+        """Bring the caches up to date after the cell at (y, x) changed from old to value."""
+        self._colors = None
+        self._version += 1
+        data = self._data
+        if data is not None:
+            if (type(value) is int or isinstance(value, np.integer)) and -128 <= value <= 127 and data.dtype.char == 'b':
+                np.ndarray.__setitem__(data, (y, x), value)
             else:
-                self.color = None
-    
+                self._data = None
+        if self._histogram is not None:
+            self._count_written(y, x, old, value)
+
+    def _count_written(self, y: int, x: int, old, value):
+        """Move one cell from old to value in the histogram instead of recounting the grid."""
+        histogram = self._histogram
+        if histogram is None or histogram[0] != self._version - 1 or type(old) is not int or type(value) is not int:
+            self._histogram = None
+            return
+        # new dicts, so a histogram tuple that reached another grid keeps describing that grid's cells
+        counts, first = dict(histogram[1]), dict(histogram[2])
+        if old != value:
+            counts[old] -= 1
+            if not counts[old]:
+                del counts[old], first[old]
+            elif first[old] == (y, x):
+                self._histogram = None
+                return
+            counts[value] = counts.get(value, 0) + 1
+            if value not in first or (y, x) < first[value]:
+                first[value] = (y, x)
+        self._histogram = (self._version, counts, first)
+
+    def _value_counts(self) -> tuple[dict[int, int], dict[int, tuple[int, int]]]:
+        """Count per value and the first cell holding it, from one bincount of the cell array per version."""
+        histogram = self._histogram
+        if histogram is None or histogram[0] != self._version:
+            data = self.data
+            counts: dict[int, int]
+            first: dict[int, tuple[int, int]]
+            if data.dtype.kind not in 'iu':
+                counts, first = {}, {}
+                for y, row in enumerate(self):
+                    for x, col in enumerate(row):
+                        if isinstance(col, int):
+                            counts[col] = counts.get(col, 0) + 1
+                            first.setdefault(col, (y, x))
+            else:
+                flat = data.view(np.ndarray).ravel().astype(np.intp)
+                low = int(flat.min()) if flat.size else 0
+                shifted = flat - low
+                bins = np.bincount(shifted)
+                present = np.flatnonzero(bins)
+                positions = np.full(len(bins), flat.size, dtype=np.intp)
+                np.minimum.at(positions, shifted, np.arange(flat.size, dtype=np.intp))
+                width = data.shape[1]
+                counts = dict(zip((present + low).tolist(), bins[present].tolist()))
+                first = {value: divmod(position, width) for value, position in zip((present + low).tolist(), positions[present].tolist())}
+            histogram = self._histogram = (self._version, counts, first)
+        return histogram[1], histogram[2]
+
+    def _pull_rows(self):
+        """Copy the cell array back into the rows after a vectorized write; short rows keep their length."""
+        data = self._data
+        assert data is not None
+        for row, values in zip(list.__iter__(self), data.tolist()):
+            list.__setitem__(row, slice(None), values[:len(row)])
+
+    def _sync_rows(self):
+        """Re-own the rows after rows were added, removed or reordered."""
+        seen = set()
+        for y, row in enumerate(list.__iter__(self)):
+            if isinstance(row, (list, tuple)) and (type(row) is not GridRow or row._grid is not self or id(row) in seen):
+                row = GridRow(row, self.allow_negative_index)
+                list.__setitem__(self, y, row)
+            if type(row) is GridRow:
+                row._grid = self
+                row._y = y
+                seen.add(id(row))
+        self._data = self._colors = self._center = self._all_points = None
+        self._version += 1
+
+    __setitem__ = _reshapes_grid(SafeList.__setitem__)
+    append = _reshapes_grid(list.append)
+    extend = _reshapes_grid(list.extend)
+    insert = _reshapes_grid(list.insert)
+    pop = _reshapes_grid(list.pop)
+    remove = _reshapes_grid(list.remove)
+    clear = _reshapes_grid(list.clear)
+    sort = _reshapes_grid(list.sort)
+    reverse = _reshapes_grid(list.reverse)
+    __delitem__ = _reshapes_grid(list.__delitem__)
+    __iadd__ = _reshapes_grid(list.__iadd__)
+    __imul__ = _reshapes_grid(list.__imul__)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_data', None)
+        state.pop('_views', None)
+        state.pop('_frozen', None)
+        return state
+
     def enlarge(self, factor: int):
-        data = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                row.extend([self[i][j]] * factor)
-            data.extend([row] * factor)
-        return Grid(data, self.background_color)
-    
+        values = self.data.view(np.ndarray)
+        return Grid(values.repeat(factor, axis=0).repeat(factor, axis=1).tolist(), self.background_color)
+
+    def resample(self, height: int, width: int, method: str = 'nearest'):
+        """
+        Resize to height x width by any ratio. 'nearest' takes the cell each target cell falls on;
+        'majority' takes the most common value of the source block it covers, ties going to the smaller value.
+        """
+        values = self.data.view(np.ndarray)
+        rows = np.arange(height) * values.shape[0] // height
+        cols = np.arange(width) * values.shape[1] // width
+        if method == 'nearest' or not values.size:
+            return Grid(values[np.ix_(rows, cols)].tolist(), self.background_color)
+        if method != 'majority':
+            raise ValueError(f"Unknown resampling method: {method}")
+        candidates = np.unique(values)
+        counts = np.stack([np.add.reduceat(np.add.reduceat((values == value).astype(np.int32), rows, axis=0), cols, axis=1) for value in candidates])
+        return Grid(candidates[counts.argmax(axis=0)].tolist(), self.background_color)
+
     def is_solo(self, row: int, col: int):
         current_color = self[row][col]
         cardinal_cells = [self[row + dy][col + dx] for dx, dy in CARDINAL_DIRECTIONS]
@@ -244,212 +699,236 @@ class Grid(SafeList):
         """Shrink a grid by the given factor while maintaining pattern structure."""
         if factor <= 1:
             return self
-        
-        rows = len(self)
-        cols = len(self[0]) if self else 0
-        
-        new_rows = rows // factor
-        new_cols = cols // factor
-        
-        shrunk = []
-        for i in range(new_rows):
-            row = []
-            for j in range(new_cols):
-                # Take the most common value in the factor x factor block
-                values = []
-                block = []
-                start_row = i * factor
-                start_col = j * factor
-                for di in range(factor):
-                    block_row = []
-                    for dj in range(factor):
-                        if start_row + di < rows and start_col + dj < cols:
-                            value = self[start_row + di][start_col + dj]
-                            values.append(value)
-                            block_row.append(value)
-                    if block_row:
-                        block.append(block_row)
-                
-                # Check if all values in the block are the same
-                if values:
-                    if len(set(values)) != 1:
-                        raise ValueError(f"Region ({start_col},{start_row}) to ({start_col+factor-1},{start_row+factor-1}) has different values:\n{block}")
-                    row.append(values[0])
-                else:
-                    row.append(0)
-            shrunk.append(row)
-        
-        return Grid(shrunk, self.background_color)
+        values = self.data.view(np.ndarray)
+        new_rows, new_cols = values.shape[0] // factor, values.shape[1] // factor
+        blocks = values[:new_rows * factor, :new_cols * factor].reshape(new_rows, factor, new_cols, factor)
+        mixed = (blocks != blocks[:, :1, :, :1]).any(axis=(1, 3))
+        if mixed.any():
+            i, j = np.argwhere(mixed)[0].tolist()
+            start_row, start_col = i * factor, j * factor
+            raise ValueError(f"Region ({start_col},{start_row}) to ({start_col+factor-1},{start_row+factor-1}) has different values:\n{blocks[i, :, j].tolist()}")
+        return Grid(blocks[:, 0, :, 0].tolist(), self.background_color)
 
     
     def flatten_list(self):
-        return [self[i][j] for i in range(self.height) for j in range(self.width)]
+        return self.data[:self.height, :self.width].ravel().tolist()
     
+    @memoize
     def shrink(self, factor = None):
         """Find the maximum factor that can be used to shrink the grid by detecting pattern boundaries."""
         if factor:
             return self._shrink(factor)
 
-        rows = len(self)
-        cols = len(self[0]) if self else 0
-        
-        # Find the smallest repeating pattern size
-        def find_pattern_size():
-            # Check first row for pattern repetition
-            first_row = self[0]
-            first_element = first_row[0]
-            
-            # Count how many times the first element repeats
-            repetition_count = 0
-            for i in range(len(first_row)):
-                if first_row[i] == first_element:
-                    repetition_count += 1
-                else:
-                    break
-            
-            return repetition_count
-        
-        pattern_size = find_pattern_size()
-        
-        # Use the pattern size as the factor, but ensure it divides the grid dimensions
-        max_factor = min(pattern_size, rows, cols)
-        
-        # Find the largest factor that divides both rows and cols
-        for factor in range(max_factor, 0, -1):
-            if rows % factor == 0 and cols % factor == 0:
-                try:
-                    return self._shrink(factor)
-                except ValueError:
-                    continue
-        
-        return self
+        values = self.data.view(np.ndarray)
+        if not values.size:
+            return self
+        # every block edge of the largest factor falls on a multiple of it, so the factor is the gcd of the run boundaries
+        boundaries = np.concatenate([
+            np.flatnonzero((values[:, 1:] != values[:, :-1]).any(axis=0)) + 1,
+            np.flatnonzero((values[1:] != values[:-1]).any(axis=1)) + 1,
+            values.shape,
+        ])
+        return self._shrink(int(np.gcd.reduce(boundaries)))
 
     def strip(self):
         # remove all empty rows and columns
-        starting_row_point = 0
-        for row_idx in range(self.height):
-            if all(cell == self.background_color for cell in self[row_idx]):
-                starting_row_point += 1
-            else:
-                break
-        ending_row_point = self.height - 1
-        for row_idx in reversed(range(self.height)):
-            if all(cell == self.background_color for cell in self[row_idx]):
-                ending_row_point -= 1
-            else:
-                break
-        starting_col_point = 0
-        for col_idx in range(self.width):
-            if all(row[col_idx] == self.background_color for row in self):
-                starting_col_point += 1 
-            else:
-                break
-        ending_col_point = self.width - 1
-        for col_idx in reversed(range(self.width)):
-            if all(row[col_idx] == self.background_color for row in self):
-                ending_col_point -= 1
-            else:
-                break
-        data = [row[starting_col_point:ending_col_point + 1] for row in self[starting_row_point:ending_row_point + 1]]
-        return Grid(data, self.background_color)
+        foreground = self.data != self.background_color
+        rows = np.flatnonzero(foreground.any(axis=1))
+        cols = np.flatnonzero(foreground.any(axis=0))
+        if not len(rows):
+            return Grid([], self.background_color)
+        return Grid(self.data[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1].tolist(), self.background_color)
     
     def __hash__(self) -> int: # type: ignore
-        return hash((tuple(tuple(row) for row in self), self.background_color))
+        cached = self._hash
+        if cached is None or cached[0] != self._version:
+            cached = self._hash = (self._version, hash((tuple(tuple(row) for row in self), self.background_color)))
+        return cached[1]
+
+    def _content_key(self) -> tuple:
+        """Cache key of the cells, background and shape: grids with equal keys give equal analysis results."""
+        cached = self._key
+        if cached is None or cached[0] != self._version:
+            data = self.data
+            # the bytes of an object array are pointers, so its cells are keyed on their reprs
+            content = repr(data.tolist()).encode() if data.dtype.kind == 'O' else data.tobytes()
+            digest = hashlib.blake2b(content, digest_size=16).digest()
+            cached = self._key = (self._version, (type(self).__name__, data.shape, data.dtype.str, digest, self._background_color, self.allow_negative_index))
+        return cached[1]
     
     def is_hole(self, region: GridRegion):
-        logger.info(f"Checking if {region} is a hole")
+        logger.info("Checking if %s is a hole", region)
         for row in range(region.y1 - 1, region.y2 + 2):
             for col in range(region.x1 - 1, region.x2 + 2):
                 # if edge not background color, then it is not a hole
                 if row == region.y1 - 1 or row == region.y2 + 1 or col == region.x1 - 1 or col == region.x2 + 1:
                     if self[row][col] == self.background_color:
-                        logger.info(f"Edge {row},{col} is background color")
+                        logger.info("Edge %s,%s is background color", row, col)
                         return False
                 else:
                     if self[row][col] != self.background_color:
-                        logger.info(f"Internal {row},{col} is not background color")
+                        logger.info("Internal %s,%s is not background color", row, col)
                         return False
         return True
     
     def as_sub_grid(self):
         return SubGrid(GridRegion([GridPoint(0, 0), GridPoint(self.width - 1, self.height - 1)]), self)
 
+    @memoize
     def is_similar(self, other, ignore_color = False, rotate=True):
-        if rotate:
-            if self.height > self.width:
-                self = self.rotate()
-            if other.height > other.width:
-                other = other.rotate()
+        """Whether other has the same cells as this grid, up to a rotation when rotate is set; ignore_color only compares background against foreground."""
         if not isinstance(other, Grid):
             return False
-        # if height and width are the same, then compare the points
-        if self.height == other.height and self.width == other.width:
-            def check(self, other):
-                for row in range(self.height):
-                    for col in range(self.width):
-                        if ignore_color:
-                            c1 = self[row][col] == self.background_color
-                            c2 = other[row][col] == other.background_color
-                            if c1 != c2:
-                                return False
-                        else:
-                            if self[row][col] != other[row][col]:
-                                return False
-                return True
-            
-            if rotate:
-                for _ in range(4):
-                    for _ in range(4):
-                        if check(self, other):
-                            return True
-                        other = other.rotate()
-                    self = self.rotate()
-            else:
-                return check(self, other)
-        return False
-    
+        return self.similarity_key(ignore_color, rotate) == other.similarity_key(ignore_color, rotate)
+
+    def similarity_key(self, ignore_color: bool = False, rotate: bool = True) -> tuple:
+        """
+        Key that is equal for two grids exactly when is_similar holds: the cells (or the background mask with
+        ignore_color) in their lexicographically smallest rotation. Kept until the grid next changes.
+        """
+        cached = self._similarity_keys
+        if cached is None or cached[0] != self._version:
+            cached = self._similarity_keys = (self._version, {})
+        key = cached[1].get((ignore_color, rotate))
+        if key is None:
+            kinds = [Transform.IDENTITY, Transform.ROTATE, Transform.ROTATE_180, Transform.ANTI_ROTATE] if rotate else [Transform.IDENTITY]
+            variants = []
+            for kind in kinds:
+                values = self.transformed(kind)
+                if ignore_color:
+                    values = values == self.background_color
+                elif values.dtype.kind == 'O':
+                    # object cells (such as the [] read past a SubGrid's parent) are compared by their reprs
+                    variants.append((values.shape, repr(values.tolist()).encode()))
+                    continue
+                else:
+                    values = values.astype(np.int64)
+                variants.append((values.shape, values.tobytes()))
+            key = cached[1][(ignore_color, rotate)] = min(variants)
+        return key
+
+    def transformed(self, kind: Transform | str) -> np.ndarray:
+        """
+        The cells under a D4 transform, as a read-only view of the cell array.
+        The eight views are kept until the grid next changes, so repeated symmetry checks do not recompute them.
+        """
+        if isinstance(kind, str):
+            kind = Transform(kind)
+        data = self.data
+        cached = self._transforms
+        # the views follow the array they were taken of, so a replaced array invalidates them at any version
+        if cached is None or cached[0] != self._version or cached[1] is not data:
+            cached = self._transforms = (self._version, data, {})
+        views = cached[2]
+        view = views.get(kind)
+        if view is None:
+            values = data.view(np.ndarray)[:]
+            values.flags.writeable = False
+            view = views[kind] = _TRANSFORMS[kind](values)
+        return view
+
+    def find_template(self, template: 'Grid | list[list[int]]', wildcard: int | None = None, transparent: bool = False, transforms: bool = False, ignore_color: bool = False) -> list['TemplateMatch']:
+        """
+        Every placement of template in this grid in row-major order, with the D4 transform that fits when transforms
+        is set (each distinct variant once). Template cells of the wildcard colour, and its background cells when
+        transparent, match anything; ignore_color only compares background against foreground.
+        Each template cell narrows all candidate offsets at once with one shifted array comparison.
+        """
+        if not isinstance(template, Grid):
+            template = Grid(template)
+        values = self.data.view(np.ndarray)
+        if ignore_color:
+            values = values != self.background_color
+        height, width = values.shape
+        kinds = list(Transform) if transforms else [Transform.IDENTITY]
+        seen = set()
+        found: list[tuple[int, int, int, tuple[int, ...]]] = []
+        for order, kind in enumerate(kinds):
+            cells = template.transformed(kind)
+            care = np.ones(cells.shape, dtype=bool)
+            if wildcard is not None:
+                care &= cells != wildcard
+            if transparent:
+                care &= cells != template.background_color
+            if ignore_color:
+                cells = cells != template.background_color
+            key = (cells.shape, cells[care].tobytes(), care.tobytes())
+            rows, cols = height - cells.shape[0] + 1, width - cells.shape[1] + 1
+            if key in seen or not cells.size or rows <= 0 or cols <= 0:
+                continue
+            seen.add(key)
+            fits = np.ones((rows, cols), dtype=bool)
+            for y, x in np.argwhere(care).tolist():
+                fits &= values[y:y + rows, x:x + cols] == cells[y, x]
+                if not fits.any():
+                    break
+            found.extend((y, x, order, cells.shape) for y, x in np.argwhere(fits).tolist())
+        return [TemplateMatch(GridRegion([GridPoint(x, y), GridPoint(x + w - 1, y + h - 1)]), kinds[order]) for y, x, order, (h, w) in sorted(found)]
+
+    def symmetry_report(self, mask_color: int | None = None, tolerance: float = 0.0, min_coverage: float = 0.5) -> list[Symmetry]:
+        """
+        Horizontal, vertical, diagonal and rotational symmetries of the cells, on- and off-centre, with the cells
+        violating each. See arc_tools.symmetry.symmetry_report.
+        """
+        return symmetry_report(self.data.view(np.ndarray), mask_color, tolerance, min_coverage)
+
+    def cast_rays(self, origins: list[tuple[int, int]], directions: list[tuple[int, int]], stop_colors: list[int] | None = None, bounces: int = 0, max_length: int | None = None) -> list[Ray]:
+        """
+        Rays from each (x, y) origin in each (dx, dy) direction up to a cell of stop_colors (default any
+        non-background colour) or the border, reflected off up to bounces obstacles. See arc_tools.rays.cast_rays.
+        """
+        values = self.data.view(np.ndarray)
+        blocked = values != self.background_color if stop_colors is None else np.isin(values, stop_colors)
+        return cast_rays(blocked, origins, directions, bounces, max_length)
+
+    def draw_lines(self, segments: list[tuple[tuple[int, int], tuple[int, int]]], color: int, only_background: bool = False) -> 'Grid':
+        """
+        Paint the (x, y) to (x, y) segments in color with one write, cells off the grid left out; with
+        only_background, cells already holding a colour are kept.
+        """
+        if isinstance(color, Color):
+            color = color.value
+        xs, ys = segment_cells(segments, self.width, self.height)
+        if only_background:
+            keep = self.data.view(np.ndarray)[ys, xs] == self.background_color
+            xs, ys = xs[keep], ys[keep]
+        return self._paint(ys, xs, color)
+
+    def _paint(self, ys: np.ndarray, xs: np.ndarray, color: int) -> 'Grid':
+        """Set the (ys, xs) cells to color with one write; a color the cell array cannot hold widens it."""
+        if len(xs):
+            self.data[ys, xs] = color
+        return self
+
+    def draw_line(self, start: tuple[int, int], end: tuple[int, int], color: int, only_background: bool = False) -> 'Grid':
+        return self.draw_lines([(start, end)], color, only_background)
+
+    def transform(self, kind: Transform | str) -> 'Grid':
+        """New grid holding the cells under a D4 transform; a SubGrid gives a SubGrid over a grid of its own."""
+        values = self.transformed(kind)
+        height, width = values.shape
+        grid = Grid(values.tolist(), self.background_color)
+        if type(self) == SubGrid:
+            return SubGrid(GridRegion([GridPoint(0, 0), GridPoint(width - 1, height - 1)]), grid, self.color)
+        return grid
+
     def rotate(self) -> 'Grid':
         """
         Rotates 90 degrees clockwise.
         """
-        rows = self.height
-        cols = self.width
-        new_grid = [[self[rows-1-j][i] for j in range(rows)] for i in range(cols)]
-        if type(self) == SubGrid:
-            return SubGrid(GridRegion([GridPoint(0, 0), GridPoint(rows-1, cols-1)]), Grid(new_grid, self.background_color), self.color)
-        else:
-            return Grid(new_grid, self.background_color)
+        return self.transform(Transform.ROTATE)
 
     def anti_rotate(self) -> 'Grid':
         """
         Rotate 90 degrees counter-clockwise.
         """
-        rows = self.height
-        cols = self.width
-        new_grid = [[self[j][cols-1-i] for j in range(rows)] for i in range(cols)]
-        if type(self) == SubGrid:
-            return SubGrid(GridRegion([GridPoint(0, 0), GridPoint(rows-1, cols-1)]), Grid(new_grid, self.background_color), self.color)
-        else:
-            return Grid(new_grid, self.background_color)
+        return self.transform(Transform.ANTI_ROTATE)
     
     def flip_horizontally(self) -> 'Grid':
-        rows = self.height
-        cols = self.width
-        new_grid = [self[rows-1-j] for j in range(rows)]
-        if type(self) == SubGrid:
-            g = Grid(new_grid, self.background_color)
-            return SubGrid(GridRegion([GridPoint(0, 0), GridPoint(cols-1, rows-1)]), g, self.color)
-        else:
-            return Grid(new_grid, self.background_color)
+        return self.transform(Transform.FLIP_HORIZONTALLY)
 
     def flip_vertically(self) -> 'Grid':
-        rows = self.height
-        cols = self.width
-        new_grid = [[self[j][cols-1-i] for i in range(cols)] for j in range(rows)]
-        if type(self) == SubGrid:
-            return SubGrid(GridRegion([GridPoint(0, 0), GridPoint(cols-1, rows-1)]), Grid(new_grid, self.background_color), self.color)
-        else:
-            return Grid(new_grid, self.background_color)
+        return self.transform(Transform.FLIP_VERTICALLY)
 
     def get(self, x: int, y: int) -> int:
         return self[y][x]
@@ -506,18 +985,18 @@ class Grid(SafeList):
         """ self is Actual, other is Expected """
         if len(self) != len(other):
             if not silent:
-                logger.info(f"Row length mismatch: Expected: {len(other)}, Actual: {len(self)}")
+                logger.info("Row length mismatch: Expected: %s, Actual: %s", len(other), len(self))
             return False
         for i in range(len(self)):
             if self[i] != other[i]:
                 if len(self[i]) != len(other[i]):
                     if not silent:
-                        logger.info(f"Column length mismatch for row {i+1}: Expected: {len(other[i])}, Actual: {len(self[i])}")
+                        logger.info("Column length mismatch for row %s: Expected: %s, Actual: %s", i + 1, len(other[i]), len(self[i]))
                     return False
                 for j in range(len(self[i])):
                     if self[i][j] != other[i][j]:
                         if not silent:
-                            logger.info(f"Mismatch at index row {i}, col {j}: Expected: {other[i][j]}, Actual: {self[i][j]}")
+                            logger.info("Mismatch at index row %s, col %s: Expected: %s, Actual: %s", i, j, other[i][j], self[i][j])
                         return False
         return True
     
@@ -538,7 +1017,7 @@ class Grid(SafeList):
                 for col in range(self.width):
                     if self[row][col] == old_color:
                         self[row][col] = new_color
-        self.colors = self.get_unique_values()
+        self._colors = None
         return self
     
     def replace_all_color(self, new_color, in_place: bool = False):
@@ -553,27 +1032,42 @@ class Grid(SafeList):
                         self[row][col] = new_color
         return self
     
-    def fill_color(self, point: GridPoint, new_color: int):
-        # use bfs to fill the color
-        queue = deque([point])
-        old_color = self[point.y][point.x]
-        while queue:
-            point = queue.popleft()
-            if self[point.y][point.x] == new_color:
-                continue
-            old_color = self[point.y][point.x]
-            self[point.y][point.x] = new_color
-            for dx, dy in EIGHT_DIRECTIONS:
-                new_col = point.x + dx
-                new_row = point.y + dy
-                if 0 <= new_col < self.width and 0 <= new_row < self.height:
-                    if self[new_row][new_col] == old_color:
-                        queue.append(GridPoint(new_col, new_row))
-
+    def flood_fill(self, seeds: list[tuple[int, int]], color: int | None = None, go_diagonal: bool = False, stop_colors: list[int] | None = None, mask: np.ndarray | None = None, region: GridRegion | None = None) -> np.ndarray:
+        """
+        Fill from every (x, y) seed at once and return the mask of the filled cells, painting them in color unless
+        it is None. Without stop_colors each seed spreads over the cells of its own colour; with them it spreads
+        over any cells not of stop_colors. mask and region (inclusive) restrict where the fill may go.
+        The fillable cells are labelled once with label_components and the seeds' components are kept.
+        """
+        if isinstance(color, Color):
+            color = color.value
+        values = self.data.view(np.ndarray)
+        height, width = values.shape
+        fillable = np.ones(values.shape, dtype=bool) if mask is None else np.array(mask, dtype=bool)
+        if region is not None:
+            inside = np.zeros(values.shape, dtype=bool)
+            inside[max(region.y1, 0):region.y2 + 1, max(region.x1, 0):region.x2 + 1] = True
+            fillable &= inside
+        if stop_colors:
+            fillable &= ~np.isin(values, stop_colors)
+        seeds = [(x, y) for x, y in seeds if 0 <= x < width and 0 <= y < height and fillable[y, x]]
+        if not seeds:
+            return np.zeros(values.shape, dtype=bool)
+        labels = label_components(values, fillable, go_diagonal, single_color_only=not stop_colors).labels
+        filled = np.isin(labels, [labels[y, x] for x, y in seeds])
+        if color is not None:
+            ys, xs = np.nonzero(filled)
+            self._paint(ys, xs, color)
+        return filled
+
+    def fill_color(self, point: GridPoint, new_color: int, go_diagonal: bool = True):
+        """Paint the region of cells sharing the colour of point (8-connected by default) in new_color."""
+        if self[point.y][point.x] != new_color:
+            self.flood_fill([(point.x, point.y)], new_color, go_diagonal)
         return self
     
     def replace_dot(self, dot_color, obj: 'SubGrid', dx: int, dy: int, first_grid: 'Grid'):
-        logger.debug(f"Replacing dot {dot_color} with object {obj} at {dx}, {dy}")
+        logger.debug("Replacing dot %s with object %s at %s, %s", dot_color, obj, dx, dy)
         for row in range(self.height):
             for col in range(self.width):
                 if first_grid[row][col] == dot_color:
@@ -588,6 +1082,9 @@ class Grid(SafeList):
         return self
     
     def crop(self, region: GridRegion):
+        if 0 <= region.x1 and 0 <= region.y1 and region.x2 < self.width and region.y2 < self.height:
+            return Grid(self.data[region.y1:region.y2 + 1, region.x1:region.x2 + 1].tolist(), self.background_color)
+        # out of bounds cells read as [] like the rows do
         return Grid([[self[row][col] for col in range(region.x1, region.x2 + 1)] for row in range(region.y1, region.y2 + 1)], self.background_color)
 
     def swap_colors(self):
@@ -598,13 +1095,67 @@ class Grid(SafeList):
         return self
     
     def remove_object(self, obj: 'SubGrid', background_color: int | None = None, clean_area: bool = False):
+        """Paint the object's cells (its whole box with clean_area) that are not background_color in background_color."""
         if background_color is None:
             background_color = self.background_color
-        for row in range(obj.height):
-            for col in range(obj.width):
-                if obj[row][col] != background_color or clean_area:
-                    self[row+obj.region.y1][col+obj.region.x1] = background_color
-        return self
+        values = obj.data.view(np.ndarray)
+        mask = np.ones(values.shape, dtype=bool) if clean_area else values != background_color
+        return self._blit_mask(mask, background_color, obj.region.x1, obj.region.y1)
+
+    def blit(self, source: 'Grid', x: int, y: int, greedy: bool = True, transparent: bool = True, fill_color: int | None = None, background_color: int | None = None, extend: bool = False, clip: bool = True) -> 'SubGrid':
+        """
+        Write source's cells with their top-left corner at (x, y) in one masked assignment and return the placed
+        SubGrid, which holds source's cells over this grid. Source cells of background_color (default source's)
+        are skipped when transparent, and cells already holding a colour are kept unless greedy. fill_color paints
+        every written cell in one colour. With extend the grid first grows right and down to fit; cells still off
+        the grid are dropped, or raise an IndexError without clip.
+        """
+        if isinstance(fill_color, Color):
+            fill_color = fill_color.value
+        values = source.data.view(np.ndarray)
+        height, width = values.shape
+        if extend:
+            self.extend_grid(max(y + height, self.height), max(x + width, self.width))
+        if not clip and (x < 0 or y < 0 or x + width > self.width or y + height > self.height):
+            raise IndexError(f"Object of size {width}x{height} at ({x}, {y}) does not fit a {self.width}x{self.height} grid")
+        if background_color is None:
+            background_color = source.background_color
+        mask = values != background_color if transparent else np.ones(values.shape, dtype=bool)
+        if not greedy:
+            x1, y1, x2, y2 = max(x, 0), max(y, 0), min(x + width, self.width), min(y + height, self.height)
+            if x1 < x2 and y1 < y2:
+                mask = mask.copy()
+                mask[y1 - y:y2 - y, x1 - x:x2 - x] &= self.data.view(np.ndarray)[y1:y2, x1:x2] == self.background_color
+        self._blit_mask(mask, values if fill_color is None else fill_color, x, y)
+        region = GridRegion([GridPoint(x, y), GridPoint(x + width - 1, y + height - 1)])
+        region.x1, region.y1 = max(region.x1, 0), max(region.y1, 0)
+        region.x2, region.y2 = min(region.x2, self.width - 1), min(region.y2, self.height - 1)
+        placed = SubGrid(region, self, source._color if isinstance(source, SubGrid) else None)
+        # the placed object keeps source's cells, not whatever the grid holds around them
+        placed._data = GridArray.bind(values[region.y1 - y:region.y2 - y + 1, region.x1 - x:region.x2 - x + 1], placed)
+        return placed
+
+    def _blit_mask(self, mask: np.ndarray, values: np.ndarray | int, x: int, y: int) -> 'Grid':
+        """
+        Write values, or one colour, where mask is set, with mask's top-left corner at (x, y), dropping cells off
+        the grid. Values the cell array cannot hold widen it, as any write through data does.
+        """
+        height, width = mask.shape
+        x1, y1, x2, y2 = max(x, 0), max(y, 0), min(x + width, self.width), min(y + height, self.height)
+        if x1 >= x2 or y1 >= y2:
+            return self
+        mask = mask[y1 - y:y2 - y, x1 - x:x2 - x]
+        if not mask.any():
+            return self
+        if tracer.enabled:
+            written = values[y1 - y:y2 - y, x1 - x:x2 - x][mask].tolist() if isinstance(values, np.ndarray) else None
+            for i, (row, col) in enumerate(np.argwhere(mask).tolist()):
+                tracer.record('blit_cell', x=col + x1, y=row + y1, value=values if written is None else written[i])
+        if isinstance(values, np.ndarray):
+            self.data[y1:y2, x1:x2][mask] = values[y1 - y:y2 - y, x1 - x:x2 - x][mask]
+            return self
+        ys, xs = np.nonzero(mask)
+        return self._paint(ys + y1, xs + x1, values)
 
     def remove_objects(self, objs: list['SubGrid']):
         for obj in objs:
@@ -613,31 +1164,29 @@ class Grid(SafeList):
 
     @override
     def copy(self):
-        new_grid_data = [list(row) for row in self]
-        return Grid(new_grid_data, self.background_color, self.allow_negative_index)
+        # an undetected background is detected the same way on the copy
+        copy = Grid(list(self), self._background_color, self.allow_negative_index)
+        copy._colors = self._colors
+        return copy
     
     def get_frame(self):
         # set all dots to background color
         copy = self.copy()
-        for row in range(self.height):
-            for col in range(self.width):
-                if copy[row][col] != self.background_color:
-                    copy[row][col] = self.background_color
+        copy.data[...] = self.background_color
         return copy
 
+    @memoize
     def get_values_count(self, all: bool = False) -> Counter:
-        values : Counter = Counter()
-        for row in self:
-            for col in row:
-                if (col != getattr(self, "background_color", None) or all) and isinstance(col, int):
-                    values[col] += 1
-        return values
+        """Count per color in order of first appearance, without the background unless all is set."""
+        counts, first = self._value_counts()
+        background_color = None if all else self.background_color
+        return Counter({value: counts[value] for value in sorted(counts, key=first.__getitem__) if all or value != background_color})
     
     def get_background_dots_count(self):
-        return self.get_values_count(all=True)[self.background_color]
+        return self._value_counts()[0].get(self.background_color, 0)
     
     def has_yellow_block(self):
-        return Color.YELLOW.value in self.get_unique_values()
+        return Color.YELLOW.value in self._value_counts()[0] and Color.YELLOW.value != self.background_color
     
     def get_unique_values(self, sort=True):
         # sort by count
@@ -649,7 +1198,8 @@ class Grid(SafeList):
     
 
     def get_total_dots(self) -> int:
-        return sum(self.get_values_count().values())
+        counts = self._value_counts()[0]
+        return sum(counts.values()) - counts.get(self.background_color, 0)
     
     def get_total_unique_dots(self) -> int:
         return len(self.get_unique_values())
@@ -660,13 +1210,15 @@ class Grid(SafeList):
         # most_common_values = list(key for key, _ in color_counts.most_common(2))
         # if Color.BLACK.value in most_common_values and len(color_counts) > 2:
         #     return Color.BLACK.value
-        return self.get_max_color()
+        # an empty grid has no cells to count and reads as black
+        max_key, _ = max(self.get_values_count(all=True).items(), key=lambda x: x[1], default=(Color.BLACK.value, 0))
+        return max_key
 
-    def get_min_color(self) -> int:
+    def get_min_color(self) -> int | None:
         min_key, _ = min(self.get_values_count().items(), key=lambda x: x[1], default=(None, 0))
         return min_key
     
-    def get_max_color(self) -> int:
+    def get_max_color(self) -> int | None:
         max_key, _ = max(self.get_values_count().items(), key=lambda x: x[1], default=(None, 0))
         return max_key
     
@@ -735,83 +1287,237 @@ class Grid(SafeList):
                 line += f"{col:>{max_digits}} "
             logger.info(line)
     
+    def get_holes(self) -> Components:
+        """
+        Holes of the grid: 4-connected background regions that do not touch the border, labelled once per version.
+        holes.enclosing[i] is the index of the object bounding hole i from above, among the 8-connected
+        non-background components of this grid's cells.
+        """
+        cached = self._holes
+        if cached is None or cached[0] != self._version:
+            values = self.data.view(np.ndarray)
+            height, width = values.shape
+            background = values == self.background_color
+            regions = label_components(values, background, go_diagonal=False)
+            x1, y1, x2, y2 = regions.boxes.T
+            holes = regions.select((x1 > 0) & (y1 > 0) & (x2 < width - 1) & (y2 < height - 1))
+            # the cell above a hole's first cell is not background, or it would belong to the hole
+            x, y = holes.extremes[:, 2].T
+            holes.enclosing = label_components(values, ~background).labels[y - 1, x]
+            holes.enclosing.flags.writeable = False
+            cached = self._holes = (self._version, holes)
+        return cached[1]
+
+    def rectangle_index(self) -> RectangleIndex:
+        """Summed-area tables of the cells for O(1) rectangle queries, kept until the grid next changes."""
+        cached = self._rectangles
+        if cached is None or cached[0] != self._version:
+            cached = self._rectangles = (self._version, RectangleIndex(self.data.view(np.ndarray), self.background_color))
+        return cached[1]
+
+    @memoize
     def get_holes_count(self, max_count: int | None = None) -> int:
         """Count the number of distinct hole regions (connected components of background color)."""
-        rows, cols = len(self), len(self[0])
-        visited = [[False for _ in range(cols)] for _ in range(rows)]
-        
-        # First, mark all background cells connected to the border as visited (not holes)
-        q : deque[tuple[int, int]] = deque()
-
-        for r in range(rows):
-            # Left border
-            if self[r][0] == self.background_color and not visited[r][0]:
-                q.append((r, 0))
-                visited[r][0] = True
-            # Right border
-            if self[r][cols - 1] == self.background_color and not visited[r][cols - 1]:
-                q.append((r, cols - 1))
-                visited[r][cols - 1] = True
-
-        for c in range(cols): # Avoid double-adding corners
-            # Top border
-            if self[0][c] == self.background_color and not visited[0][c]:
-                q.append((0, c))
-                visited[0][c] = True
-            # Bottom border
-            if self[rows - 1][c] == self.background_color and not visited[rows - 1][c]:
-                q.append((rows - 1, c))
-                visited[rows - 1][c] = True
-
-        # Flood fill from border background cells
-        while q:
-            r, c = q.popleft()
-            for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < rows and 0 <= nc < cols and \
-                self[nr][nc] == self.background_color and not visited[nr][nc]:
-                    visited[nr][nc] = True
-                    q.append((nr, nc))
+        count = len(self.get_holes())
+        return min(count, max_count) if max_count else count
+    
 
-        # Now count distinct hole regions (unvisited background cells)
-        hole_regions_count = 0
-        for r in range(rows):
-            for c in range(cols):
-                if self[r][c] == self.background_color and not visited[r][c]:
-                    # Found a new hole region, flood fill it
-                    hole_regions_count += 1
-                    if max_count and hole_regions_count == max_count:
-                        return hole_regions_count
-                    
-                    # Mark all cells in this hole region as visited
-                    region_q = deque([(r, c)])
-                    visited[r][c] = True
-                    
-                    while region_q:
-                        cr, cc = region_q.popleft()
-                        for dr, dc in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                            nr, nc = cr + dr, cc + dc
-                            if 0 <= nr < rows and 0 <= nc < cols and \
-                            self[nr][nc] == self.background_color and not visited[nr][nc]:
-                                visited[nr][nc] = True
-                                region_q.append((nr, nc))
 
-        return hole_regions_count
-    
+def _materializing(method):
+    """Wrap a list method of SubGrid so the cells are read from the parent grid first."""
+    def wrapper(self, *args, **kwargs):
+        if self._lazy:
+            self._materialize()
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    return wrapper
 
 
 class SubGrid(Grid):
+    """
+    Region of a parent grid, optionally restricted to obj_color and to the given points.
+    Creating one is O(1): the cells are read from the parent on first use, or just before the parent is
+    mutated, so a SubGrid always holds the parent's cells as they were when it was created.
+    """
+    _lazy = False
+    _parent: Grid | None = None
+    _frozen_parent: tuple[np.ndarray, int, bool] | None = None
+    _points: list[GridPoint] | None = None
+    _component: tuple[Components, int, tuple[int, int] | None] | None = None
+    _parent_version = 0
+
     def __init__(self, region: GridRegion, parent_grid: Grid, obj_color: int | None = None, points: list[GridPoint] | None = None):
-        logger.debug(f"Creating SubGrid from region {region}  and obj_color {obj_color}")
+        logger.debug("Creating SubGrid from region %s  and obj_color %s", region, obj_color)
         self.parent_grid = parent_grid
         self.region = region
         self.points = points or []
         self.background_color = self.parent_grid.background_color
-        subgrid_data = self.get_subgrid(obj_color)
         self.color = obj_color
-        super().__init__(subgrid_data, self.background_color, allow_negative_index=True, region=region)
+        SafeList.__init__(self, [], allow_negative_index=True)
+        self._lazy = True
         self.height = self.h = self.region.y2 - self.region.y1 + 1
         self.width = self.w = self.region.x2 - self.region.x1 + 1
+        self.shape = (self.width, self.height)
+        self.cx = self.region.x1 + self.region.width // 2
+        self.cy = self.region.y1 + self.region.height // 2
+        parent_grid._add_view(self)
+
+    @property
+    def parent_grid(self) -> Grid:
+        if self._parent is None:
+            # a copy builds its parent from the frozen cells on first use
+            assert self._frozen_parent is not None
+            frozen, background_color, allow_negative_index = self._frozen_parent
+            parent = self._parent = Grid(frozen.tolist(), background_color, allow_negative_index)
+            self._parent_version = 0
+            self._frozen_parent = None
+            if self._lazy and self._data is None:
+                parent._add_view(self)
+            return parent
+        return self._parent
+
+    @parent_grid.setter
+    def parent_grid(self, value: Grid):
+        self._parent = value
+        self._parent_version = getattr(value, '_version', 0)
+        self._frozen_parent = None
+
+    @property
+    def points(self) -> list[GridPoint]:
+        if self._points is None:
+            # detect_objects leaves the points to be listed from the labelled component
+            assert self._component is not None
+            components, index, start = self._component
+            self._points = [GridPoint(x, y, value) for x, y, value in components.cells(index, start)]
+        return self._points
+
+    @points.setter
+    def points(self, value: list[GridPoint]):
+        self._points = value
+        self._component = None
+
+    def _content_key(self) -> tuple:
+        region = self.region
+        parent_shape = self._parent_data().shape
+        return super()._content_key() + ((region.x1, region.y1, region.x2, region.y2), parent_shape, self._color)
+
+    def _is_same_view(self, other: 'SubGrid') -> bool:
+        """Both were taken unchanged from the same parent at the same version with the same selection, so their cells match."""
+        return (self._parent is not None and self._parent is other._parent and self._parent_version == other._parent_version
+                and self._version == other._version == 0 and self.region == other.region and self._color == other._color
+                and self._background_color == other._background_color
+                and (self._component == other._component if self._component is not None else self._points == other._points))
+
+    def _rebind(self, grid: Grid):
+        """Make grid, whose cells equal the current parent's, the parent."""
+        self.parent_grid = grid
+        if self._lazy and self._data is None:
+            grid._add_view(self)
+
+    def _point_set(self) -> set:
+        if self._component is not None and self._points is None:
+            components, index = self._component[:2]
+            x1, y1 = components.boxes[index, :2].tolist()
+            ys, xs = np.nonzero(components.mask(index))
+            return set(zip((xs + x1).tolist(), (ys + y1).tolist()))
+        return {(p.x, p.y) if isinstance(p, GridPoint) else p for p in self.points if isinstance(p, (GridPoint, tuple))}
+
+    def _parent_data(self) -> np.ndarray:
+        """The parent's cell array, or the frozen copy of it while the parent Grid is not built."""
+        if self._parent is not None:
+            return self._parent.data
+        assert self._frozen_parent is not None
+        return self._frozen_parent[0]
+
+    def _read_parent(self) -> np.ndarray | None:
+        """The cells as an array sliced from the parent's data, or None when the region or values need the list path."""
+        region, background_color, obj_color = self.region, self.background_color, self._color
+        if region.x1 < 0 or region.y1 < 0 or region.x2 < region.x1 or region.y2 < region.y1:
+            return None
+        if not isinstance(background_color, int) or not (obj_color is None or isinstance(obj_color, int)):
+            return None
+        parent_data = self._parent_data()
+        if parent_data.dtype.kind not in 'biu' or region.y2 >= parent_data.shape[0] or region.x2 >= parent_data.shape[1]:
+            return None
+        values = parent_data[region.y1:region.y2 + 1, region.x1:region.x2 + 1].view(np.ndarray)
+        keep = None
+        if self._component is not None:
+            components, index = self._component[:2]
+            keep = components.mask(index)
+            if keep.shape != values.shape:
+                return None
+        elif self.points:
+            keep = np.zeros(values.shape, dtype=bool)
+            for x, y in self._point_set():
+                if region.x1 <= x <= region.x2 and region.y1 <= y <= region.y2:
+                    keep[y - region.y1, x - region.x1] = True
+        if obj_color is not None:
+            keep = values == obj_color if keep is None else keep & (values == obj_color)
+        values = values.copy()
+        if keep is not None:
+            try:
+                values[~keep] = background_color
+            except OverflowError:
+                return None
+        return values
+
+    def _build_data(self) -> GridArray:
+        if self._lazy:
+            values = self._read_parent()
+            if values is not None:
+                return GridArray.bind(values, self)
+            self._materialize()
+        return super()._build_data()
+
+    def _detach(self):
+        """Take the snapshot of the parent's cells before the parent changes."""
+        if self._lazy and self._data is None:
+            values = self._read_parent()
+            if values is None:
+                self._materialize()
+            else:
+                self._data = self._build_data()
+
+    def _materialize(self):
+        """Build the rows of a lazily created SubGrid."""
+        if not self._lazy:
+            return
+        self._lazy = False
+        if self._data is not None:
+            rows = self._data.tolist()
+        else:
+            rows = self.get_subgrid(self._color)
+        rows = [GridRow(row, True) for row in rows]
+        for y, row in enumerate(rows):
+            row._grid = self
+            row._y = y
+        list.extend(self, rows)
+
+    def _before_change(self):
+        self._materialize()
+        super()._before_change()
+
+    def __getstate__(self):
+        self._materialize()
+        return super().__getstate__()
+
+    def __array__(self, dtype=None, copy=None):
+        return np.array(list(self), dtype=dtype)
+
+    __getitem__ = _materializing(SafeList.__getitem__)
+    __iter__ = _materializing(list.__iter__)
+    __len__ = _materializing(list.__len__)
+    __contains__ = _materializing(list.__contains__)
+    __reversed__ = _materializing(list.__reversed__)
+    __add__ = _materializing(list.__add__)
+    __mul__ = _materializing(list.__mul__)
+    __rmul__ = _materializing(list.__rmul__)
+    __lt__ = _materializing(list.__lt__)
+    __le__ = _materializing(list.__le__)
+    __gt__ = _materializing(list.__gt__)
+    __ge__ = _materializing(list.__ge__)
+    count = _materializing(list.count)
+    index = _materializing(list.index)
 
     def remove_border(self, border: int = 1):
         new_grid_region = GridRegion([GridPoint(self.region.x1 + border, self.region.y1 + border), GridPoint(self.region.x2 - border, self.region.y2 - border)])
@@ -832,6 +1538,10 @@ class SubGrid(Grid):
     def __eq__(self, other):
         if not isinstance(other, SubGrid):
             return False
+        if self._is_same_view(other):
+            return True
+        self._materialize()
+        other._materialize()
         return (self.region == other.region and 
                 self.parent_grid == other.parent_grid and 
                 self.background_color == other.background_color and
@@ -870,6 +1580,19 @@ class SubGrid(Grid):
             GridPoint(min(self.region.x2 + x2, self.parent_grid.width - 1), min(self.region.y2 + y2, self.parent_grid.height - 1))
         ]), self.parent_grid, self.color)
     
+    def get_extreme_points(self) -> dict[BorderSide, GridPoint]:
+        """
+        The object's outermost points on each side: the topmost of the leftmost points, the topmost of the
+        rightmost, the leftmost of the topmost and the leftmost of the bottommost.
+        """
+        if self._component is not None:
+            components, index = self._component[:2]
+            extremes = components.extremes[index].tolist()
+        else:
+            points = [(p.x, p.y) for p in self.points]
+            extremes = [min(points), max(points, key=lambda p: (p[0], -p[1])), min(points, key=lambda p: (p[1], p[0])), max(points, key=lambda p: (p[1], -p[0]))]
+        return {side: GridPoint(x, y, self.parent_grid[y][x]) for side, (x, y) in zip(BorderSide, extremes)}
+
     def get_border_sides(self, point: GridPoint):
         sides = []
         if point.x == self.region.x1:
@@ -927,7 +1650,35 @@ class SubGrid(Grid):
     
                     
     def copy(self):
-        return deepcopy(self)
+        """
+        Copy whose parent grid is frozen as it is now.
+        The parent is not cloned: the copy reads a read-only buffer of its cells, shared by all copies taken
+        before the parent next changes, and only builds its own parent Grid if parent_grid is accessed.
+        """
+        copied = type(self).__new__(type(self))
+        state = {key: value for key, value in self.__dict__.items() if key not in ('_parent', '_data', '_views', '_frozen', '_points') + Grid._CACHES}
+        for key, value in state.items():
+            if not isinstance(value, (int, float, str, tuple, type(None))):
+                state[key] = deepcopy(value)
+        if self._points is not None:
+            state['_points'] = [GridPoint(p.x, p.y, p.value) if type(p) is GridPoint else deepcopy(p) for p in self._points]
+        parent = self._parent
+        if type(parent) is Grid:
+            state['_frozen_parent'] = (parent._freeze(), parent.background_color, parent.allow_negative_index)
+        elif isinstance(parent, SubGrid):
+            state['_parent'] = parent.copy()
+        elif parent is not None:
+            state['_parent'] = deepcopy(parent)
+        copied.__dict__.update(state)
+        if self._lazy and self._data is not None:
+            copied._data = GridArray.bind(self._data, copied)
+        elif not self._lazy:
+            rows = [GridRow(row, True) for row in list.__iter__(self)]
+            for y, row in enumerate(rows):
+                row._grid = copied
+                row._y = y
+            list.extend(copied, rows)
+        return copied
 
     def get_points_and_sides_of_dots(self, value):
         points = self.get_position_of_dot(value)
@@ -939,13 +1690,19 @@ class SubGrid(Grid):
     def get_subgrid(self, obj_color: int | None = None, safe: bool = True):
         cls = SafeList if safe else list
         grid = [cls([self.parent_grid.background_color for _ in range(self.region.x2 - self.region.x1 + 1)]) for _ in range(self.region.y2 - self.region.y1 + 1)]
+        points = self._point_set()
         for row in range(self.region.y1, self.region.y2 + 1):
             for col in range(self.region.x1, self.region.x2 + 1):
-                if (obj_color is None or self.parent_grid[row][col] == obj_color) and (not self.points or (col, row) in self.points):
+                if (obj_color is None or self.parent_grid[row][col] == obj_color) and (not self.points or (col, row) in points):
                     grid[row - self.region.y1][col - self.region.x1] = self.parent_grid[row][col]
         return cls(grid)
     
     def get_full_grid(self) -> Grid:
+        values = self._read_parent() if self._lazy and self._data is None else None
+        if values is not None:
+            full = np.full(self.parent_grid.data.shape, self.parent_grid.background_color, dtype=values.dtype)
+            full[self.region.y1:self.region.y2 + 1, self.region.x1:self.region.x2 + 1] = values
+            return Grid(full.tolist(), self.background_color)
         n_parent_rows, n_parent_cols = len(self.parent_grid), len(self.parent_grid[0])
         grid = [[self.parent_grid.background_color for _ in range(n_parent_cols)] for _ in range(n_parent_rows)]
         for row in range(self.height):
@@ -957,43 +1714,25 @@ class SubGrid(Grid):
         """
         Checks if a grid contains a 'hollow space' - a region of 0s
         completely surrounded by non-zero values.
-        Uses BFS starting from border 0s to find all externally connected 0s.
-        Any remaining 0s are considered internal/hollow.
+        Looks the holes up in get_holes, which labels them once per version.
         """
         return self.get_holes_count(max_count=1)
     
 
 def split_into_square_boxes(original_grid: Grid, size: int, obj_color: int | None = None, required_colors: list[int] | None = None) -> list[SubGrid]:
-    grid = deepcopy(original_grid)
-    rows = len(grid)
-    cols = len(grid[0])
-    regions = []
-    for r in range(rows - size + 1):
-        for c in range(cols - size + 1):
-            is_box = True
-            for dr in range(size):
-                for dc in range(size):
-                    if required_colors:
-                        cond = grid[r + dr][c + dc] not in required_colors
-                    else:
-                        cond = grid[r + dr][c + dc] == grid.background_color
-                    if cond:
-                        is_box = False
-                        break
-                if not is_box:
-                    break
-            start_point = GridPoint(c, r)
-            end_point = GridPoint(c + size - 1, r + size - 1)
-            if is_box and grid[start_point.y][start_point.x] == grid[end_point.y][end_point.x]:
-                regions.append(GridRegion([start_point, end_point]))
-                for dr in range(size):
-                    for dc in range(size):
-                        grid[r + dr][c + dc] = grid.background_color
-
-    if not obj_color and len(required_colors) == 1:
+    if required_colors:
+        required_colors = [color.value if isinstance(color, Color) else color for color in required_colors]
+    squares = original_grid.rectangle_index().square_tiling(size, required_colors)
+    regions = [GridRegion([GridPoint(x1, y1), GridPoint(x2, y2)]) for x1, y1, x2, y2 in squares]
+    if not obj_color and required_colors and len(required_colors) == 1:
         obj_color = required_colors[0]
     return [SubGrid(region, original_grid, obj_color) for region in regions]
 
+class TemplateMatch(NamedTuple):
+    region: GridRegion
+    transform: Transform
+
+
 class Shape:
     pass
 
@@ -1003,102 +1742,120 @@ class Square(Shape):
         
         
 
-def detect_objects(grid: Grid, required_object: Shape | None = None, invert: bool = False, required_colors: list[Color| int] | None = None, ignore_colors: list[Color| int] | None = None, single_color_only: bool = False, go_diagonal: bool = True, max_count: int | None = None, ignore_corners: bool = False, point: GridPoint | None = None, width: int | None = None, height: int | None = None) -> list[SubGrid]:
-    if required_colors:
-        required_colors = [color.value if isinstance(color, Color) else color for color in required_colors]
+def _color_values(colors: list[Color | int] | None) -> list[int] | None:
+    """The colours as plain values, Color members replaced by theirs."""
+    if not colors:
+        return None
+    return [color.value if isinstance(color, Color) else color for color in colors]
+
+
+def _object_mask(values: np.ndarray, background_color: int, invert: bool, required_colors: list[int] | None, ignore_colors: list[int] | None) -> np.ndarray:
+    mask = values != background_color
     if ignore_colors:
-        ignore_colors = [color.value if isinstance(color, Color) else color for color in ignore_colors]
-    is_subgrid = type(grid) == SubGrid
-    if is_subgrid:
+        mask &= ~np.isin(values, ignore_colors)
+    if required_colors:
+        mask &= np.isin(values, required_colors)
+    return ~mask if invert else mask
+
+
+def label_objects(grid: Grid, invert: bool = False, required_colors: list[Color| int] | None = None, ignore_colors: list[Color| int] | None = None, single_color_only: bool = False, go_diagonal: bool = True, ignore_corners: bool = False) -> Components:
+    """
+    Label the objects detect_objects would find, with their boxes, sizes and colors, without building SubGrids.
+    A SubGrid is labelled on its full-size grid, as in detect_objects.
+    """
+    if type(grid) == SubGrid:
         grid = grid.get_full_grid()
-    grid_np = np.array(grid)
+    values = grid.data.view(np.ndarray)
+    mask = _object_mask(values, grid.background_color, invert, _color_values(required_colors), _color_values(ignore_colors))
+    components = label_components(values, mask, go_diagonal, single_color_only)
+    if ignore_corners:
+        x1, y1, x2, y2 = components.boxes.T
+        components = components.select((x1 != 0) & (y1 != 0) & (x2 != grid.width - 1) & (y2 != grid.height - 1))
+    return components
+
+
+def _grow_objects(grid: Grid, mask: np.ndarray, single_color_only: bool, go_diagonal: bool, max_count: int, point: GridPoint | None):
+    """Breadth-first object growth that stops expanding an object once it holds max_count points."""
+    grid_np = grid.data
     rows, cols = grid_np.shape
-    visited = np.zeros_like(grid_np, dtype=bool)
-    objects = []
-    x_offset = grid.region.x1 if is_subgrid else 0
-    y_offset = grid.region.y1 if is_subgrid else 0
-    def compare(a):
-        val = a != grid.background_color
-        if ignore_colors:
-            val = val and a not in ignore_colors
-        if required_colors:
-            val = val and a in required_colors
-        if invert:
-            return not val
-        return val
-    
-    for r in range(rows):
-        for c in range(cols):
-            if point:
-                r, c = point.y, point.x
-            current_color = grid[r][c]
-            if compare(current_color) and not visited[r, c]:
-                # Start BFS for a new object
-                current_object_points = []
-                q = deque([(r, c)])
-                visited[r, c] = True
-                
-                while q:
-                    row, col = q.popleft()
-                    current_object_points.append(GridPoint(col, row, grid[row][col])) # x=col, y=row
-                    if go_diagonal:
-                        directions = EIGHT_DIRECTIONS
-                    else:
-                        directions = CARDINAL_DIRECTIONS
-                    for dr, dc in directions:
-                        nr, nc = row + dr, col + dc
-                        if 0 <= nr < rows and 0 <= nc < cols and \
-                           compare(grid_np[nr, nc]) and not visited[nr, nc]:
-                            if single_color_only and grid_np[nr, nc] != current_color:
-                                continue
-                            if max_count and len(current_object_points) >= max_count:
-                                break
-                            visited[nr, nc] = True
-                            q.append((nr, nc))
-                
-                if is_subgrid:
-                    # add x1 and y1 to current_object_points
-                    current_object_points = [GridPoint(p.x + x_offset, p.y + y_offset, grid[p.y][p.x]) for p in current_object_points]
-                    
-                # filter only the corner points
-                current_object_corner_points = [
-                    p for p in current_object_points
-                    if p.x == min(p.x for p in current_object_points)
-                    or p.x == max(p.x for p in current_object_points)
-                    or p.y == min(p.y for p in current_object_points)
-                    or p.y == max(p.y for p in current_object_points)
-                ]
-                region = GridRegion(current_object_points)
-                if ignore_corners:
-                    if region.x1 == 0 or region.y1 == 0 or region.x2 == grid.width - 1 or region.y2 == grid.height - 1:
+    visited = np.zeros_like(mask)
+    directions = EIGHT_DIRECTIONS if go_diagonal else CARDINAL_DIRECTIONS
+    seeds = [(point.y, point.x)] if point else product(range(rows), range(cols))
+    for r, c in seeds:
+        if not (0 <= r < rows and 0 <= c < cols and mask[r, c]) or visited[r, c]:
+            continue
+        current_color = grid[r][c]
+        current_object_points = []
+        q = deque([(r, c)])
+        visited[r, c] = True
+        while q:
+            row, col = q.popleft()
+            current_object_points.append(GridPoint(col, row, grid[row][col]))
+            for dr, dc in directions:
+                nr, nc = row + dr, col + dc
+                if 0 <= nr < rows and 0 <= nc < cols and mask[nr, nc] and not visited[nr, nc]:
+                    if single_color_only and grid_np[nr, nc] != current_color:
                         continue
-                obj_color = current_color if single_color_only else None
-                obj = SubGrid(region, grid, obj_color, points=current_object_points)
-                if isinstance(required_object, Square):
-                    size = required_object.size
-                    if not size:
-                        size = obj.height
-                    if obj.height == size and obj.width == size and list(obj.get_values_count().values())[0] == obj.area:
-                        objects.append(obj)
-                    else:
-                        new_objects = split_into_square_boxes(obj.get_full_grid(), size, obj_color, required_colors)
-                        logger.debug(f"Found {len(new_objects)} square boxes")
-                        for new_obj in new_objects:
-                            if new_obj.height == size and new_obj.width == size:
-                                objects.append(new_obj)
-                elif width and width != obj.width:
-                    for w in range(0, obj.width, width):
-                        region = GridRegion([GridPoint(obj.region.x1 + w, obj.region.y1), GridPoint(obj.region.x1 + w + width - 1, obj.region.y2)])
-                        objects.append(detect_objects(SubGrid(region, obj.parent_grid))[0])
-                elif height and height != obj.height:
-                    for h in range(0, obj.height, height):
-                        region = GridRegion([GridPoint(obj.region.x1, obj.region.y1 + h), GridPoint(obj.region.x2, obj.region.y1 + h + height - 1)])
-                        objects.append(detect_objects(SubGrid(region, obj.parent_grid))[0])
-                else:
-                    objects.append(obj)
-                if point:
-                    break
-    logger.debug(f"Found {len(objects)} objects")
+                    if len(current_object_points) >= max_count:
+                        break
+                    visited[nr, nc] = True
+                    q.append((nr, nc))
+        yield current_color, current_object_points
+
+
+@memoize
+def detect_objects(grid: Grid, required_object: Shape | None = None, invert: bool = False, required_colors: list[Color| int] | None = None, ignore_colors: list[Color| int] | None = None, single_color_only: bool = False, go_diagonal: bool = True, max_count: int | None = None, ignore_corners: bool = False, point: GridPoint | None = None, width: int | None = None, height: int | None = None) -> list[SubGrid]:
+    required, ignored = _color_values(required_colors), _color_values(ignore_colors)
+    if type(grid) == SubGrid:
+        grid = grid.get_full_grid()
+    if max_count:
+        mask = _object_mask(grid.data.view(np.ndarray), grid.background_color, invert, required, ignored)
+        found = [(GridRegion(points), color, points) for color, points in _grow_objects(grid, mask, single_color_only, go_diagonal, max_count, point)]
+    else:
+        components = label_objects(grid, invert, required_colors, ignore_colors, single_color_only, go_diagonal)
+        indices: range | list[int] = range(components.count)
+        if point:
+            inside = 0 <= point.y < grid.height and 0 <= point.x < grid.width
+            index = int(components.labels[point.y, point.x]) if inside else -1
+            indices = [index] if index >= 0 else []
+        found = []
+        for index in indices:
+            x1, y1, x2, y2 = components.boxes[index].tolist()
+            found.append((GridRegion([GridPoint(x1, y1), GridPoint(x2, y2)]), int(components.colors[index]), (components, index, point and (point.x, point.y))))
+    objects = []
+    for region, current_color, points in found:
+        if ignore_corners:
+            if region.x1 == 0 or region.y1 == 0 or region.x2 == grid.width - 1 or region.y2 == grid.height - 1:
+                continue
+        obj_color = current_color if single_color_only else None
+        if isinstance(points, list):
+            obj = SubGrid(region, grid, obj_color, points=points)
+        else:
+            obj = SubGrid(region, grid, obj_color)
+            obj._points, obj._component = None, points
+        if isinstance(required_object, Square):
+            size = required_object.size
+            if not size:
+                size = obj.height
+            if obj.height == size and obj.width == size and list(obj.get_values_count().values())[0] == obj.area:
+                objects.append(obj)
+            else:
+                new_objects = split_into_square_boxes(obj.get_full_grid(), size, obj_color, required)
+                logger.debug("Found %s square boxes", len(new_objects))
+                for new_obj in new_objects:
+                    if new_obj.height == size and new_obj.width == size:
+                        objects.append(new_obj)
+        elif width and width != obj.width:
+            for w in range(0, obj.width, width):
+                region = GridRegion([GridPoint(obj.region.x1 + w, obj.region.y1), GridPoint(obj.region.x1 + w + width - 1, obj.region.y2)])
+                objects.append(detect_objects(SubGrid(region, obj.parent_grid))[0])
+        elif height and height != obj.height:
+            for h in range(0, obj.height, height):
+                region = GridRegion([GridPoint(obj.region.x1, obj.region.y1 + h), GridPoint(obj.region.x2, obj.region.y1 + h + height - 1)])
+                objects.append(detect_objects(SubGrid(region, obj.parent_grid))[0])
+        else:
+            objects.append(obj)
+    logger.debug("Found %s objects", len(objects))
     return objects
     
     
@@ -1108,20 +1865,16 @@ def move_object(object_to_move: SubGrid, dx: int, dy: int, grid: Grid, extend_gr
     """
     if dx == 0 and dy == 0:
         return object_to_move
-    logger.debug(f"Moving object {object_to_move} by {dx}, {dy}")
+    logger.debug("Moving object %s by %s, %s", object_to_move, dx, dy)
     grid.remove_object(object_to_move, fill_color.value if fill_color else None)
     return copy_object(object_to_move, dx, dy, grid, extend_grid, silent=True)
 
 def place_object_on_new_grid(object_to_place: SubGrid, x: int, y: int, grid: Grid, fill_color: int | None = None) -> SubGrid:
     """
-    Places the object_to_place at (x, y) in the grid, extending the grid if necessary.
+    Places the object_to_place at (x, y) in the grid, cells falling outside it dropped.
     """
-    logger.debug(f"Placing object {object_to_place} at {x}, {y}")
-    for row in range(object_to_place.height):
-        for col in range(object_to_place.width):
-            if object_to_place[row][col] != object_to_place.background_color:
-                if 0 <= y+row < len(grid) and 0 <= x+col < len(grid[0]):
-                    grid[y+row][x+col] = fill_color or object_to_place[row][col]
+    logger.debug("Placing object %s at %s, %s", object_to_place, x, y)
+    grid.blit(object_to_place, x, y, fill_color=fill_color or None)
     return SubGrid(GridRegion([GridPoint(x, y), GridPoint(x + object_to_place.width - 1, y + object_to_place.height - 1)]), grid, object_to_place.color)
 
 
@@ -1141,42 +1894,8 @@ def copy_object(object_to_copy: SubGrid, dx: int, dy: int, grid: Grid, extend_gr
     Copies the object_to_copy by (dx, dy) in the grid, extending the grid if necessary.
     """
     if not silent:
-        logger.debug(f"Copying object {object_to_copy} by {dx}, {dy} in grid of type {type(grid)}")
-    if extend_grid:
-        # Calculate new bounds
-        min_row = object_to_copy.region.y1 + dy
-        min_col = object_to_copy.region.x1 + dx
-        max_row = object_to_copy.region.y2 + dy
-        max_col = object_to_copy.region.x2 + dx
-        # Extend grid if needed
-        required_height = max(max_row + 1, grid.height)
-        required_width = max(max_col + 1, grid.width)
-        if required_height > grid.height or required_width > grid.width:
-            grid.extend_grid(required_height, required_width)
-        
-        # negative extend grid
-        if min_row < 0 or min_col < 0:
-            grid.extend_grid(-min_row, -min_col)
-    # copy the object
-
-    dx1, dy1 = object_to_copy.region.x1 + dx, object_to_copy.region.y1 + dy
-    for row in range(object_to_copy.height):
-        for col in range(object_to_copy.width):
-            value = object_to_copy[row][col]
-            row_index = row + dy1
-            col_index = col + dx1
-            logger.debug(f"Copying object {value} to {row_index}, {col_index}")
-            if value != grid.background_color:
-                if 0 <= row_index < len(grid) and 0 <= col_index < len(grid[0]):
-                    if greedy or grid[row_index][col_index] == grid.background_color:
-                        grid[row_index][col_index] = value
-
-    copied_obj = object_to_copy.copy()
-    copied_obj.region.x1 = max(copied_obj.region.x1 + dx, 0)
-    copied_obj.region.x2 = min(copied_obj.region.x2 + dx, grid.width - 1)
-    copied_obj.region.y1 = max(copied_obj.region.y1 + dy, 0)
-    copied_obj.region.y2 = min(copied_obj.region.y2 + dy, grid.height - 1)
-    return copied_obj
+        logger.debug("Copying object %s by %s, %s in grid of type %s", object_to_copy, dx, dy, type(grid))
+    return grid.blit(object_to_copy, object_to_copy.region.x1 + dx, object_to_copy.region.y1 + dy, greedy, background_color=grid.background_color, extend=extend_grid)
 
 
 def flip_horizontally(object: Grid) -> Grid:
@@ -1196,5 +1915,5 @@ if __name__ == "__main__":
     
     objects = detect_objects(test_grid,)
     # log first object
-    logger.info(f"First object: {objects[0]}")
+    logger.info("First object: %s", objects[0])
     # plot_grids([test_grid]+objects)
\ No newline at end of file
@@ -1,151 +1,47 @@
 from typing import List, Tuple, Optional
-from collections import deque
+
+import numpy as np
 
 from arc_tools.grid import FrameColor, Grid, SubGrid
+from arc_tools.pathfinding import shortest_path
 
 
 def scale_to_9x9(grid: Grid):
     """Scale grid to 9x9 by factor"""
-    grid_size = len(grid)
-    new_size = 9
-    result = [[0 for _ in range(new_size)] for _ in range(new_size)]
-    factor = grid_size / new_size
-    
-    for i in range(new_size):
-        for j in range(new_size):
-            # Map 9x9 position to 6x6 position
-            src_i = int(i * factor)
-            src_j = int(j * factor)
-            
-            # Take the value from the source position
-            result[i][j] = grid[src_i][src_j]
-    result = Grid(result, grid.background_color)
+    result = grid.resample(9, 9)
     if type(grid) != Grid:
         result = result.as_sub_grid()
     return result
 
-def path_to_moves(path: List[Tuple[int, int]]) -> List[str]:
-    moves = []
-    for i in range(1, len(path)):
-        prev_row, prev_col = path[i-1]
-        curr_row, curr_col = path[i]
-        
-        if curr_row < prev_row:
-            moves.append("move_up")
-        elif curr_row > prev_row:
-            moves.append("move_down")
-        elif curr_col < prev_col:
-            moves.append("move_left")
-        elif curr_col > prev_col:
-            moves.append("move_right")
-    return moves
-
 def find_path(grid: Grid, start_obj: SubGrid, end_obj: SubGrid, scale_factor: int) -> List[str]:
     """
-    Find path from S to E in the grid using BFS.
-    Returns list of coordinates (row, col) representing the path.
+    Find path from the start zone to the end zone of the grid using BFS.
+    Returns the list of moves along the path.
     """
     zone_size = 8 // scale_factor
     start_pos = start_obj.region.x1 // zone_size, start_obj.region.y1 // zone_size
     end_pos = end_obj.region.x1 // zone_size * zone_size / zone_size, end_obj.region.y1 // zone_size * zone_size / zone_size
-    grid = compress_grid(grid, start_pos, end_pos, scale_factor)
-    # print(start_pos, end_pos)
-    # for row in grid:
-    #     print(''.join(row))
-    rows = len(grid)
-    cols = len(grid[0])
-    
-    # Find start (S) and end (E) positions
-    start = None
-    end = None
-    
-    for row in range(rows):
-        for col in range(cols):
-            if grid[row][col] == 'S':
-                start = (row, col)
-            elif grid[row][col] == 'E':
-                end = (row, col)
-    
-    if not start or not end:
+    # one cell per zone, read at its top-left corner; the start and end zones are always passable
+    zones = grid.data.view(np.ndarray)[:len(grid) // zone_size * zone_size:zone_size, ::zone_size]
+    start, end = start_pos, (int(end_pos[0]), int(end_pos[1]))
+    rows, cols = zones.shape
+    if start == end or not all(0 <= x < cols and 0 <= y < rows for x, y in (start, end)):
         return []
-    
-    # BFS to find shortest path
-    queue = deque([(start, [start])])
-    visited = {start}
-    
-    # Directions: up, down, left, right
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-    
-    while queue:
-        (row, col), path = queue.popleft()
-        
-        if (row, col) == end:
-            return path_to_moves(path)
-        
-        for dr, dc in directions:
-            new_row, new_col = row + dr, col + dc
-            
-            # Check bounds
-            if (0 <= new_row < rows and 
-                0 <= new_col < cols and
-                (new_row, new_col) not in visited and
-                grid[new_row][new_col] != 'X'):
-                
-                visited.add((new_row, new_col))
-                new_path = path + [(new_row, new_col)]
-                queue.append(((new_row, new_col), new_path))
-    
-    return []
-
-def compress_grid(grid: Grid, start_pos: Tuple[int, int], end_pos: Tuple[int, int], scale_factor: int):
-    """function to visualize grid"""
-    compressed_grid = []
-    # zone 8*8 ; grid 64*64
-    #  now print zone row 5 only
-    zone_size = 8 // scale_factor
-    zone_row_idx_start = 0
-    zone_row_idx_end = len(grid) // zone_size - 1
-
-
-    for zone_row_idx, zone_row in enumerate(grid[zone_row_idx_start*zone_size:(zone_row_idx_end+1)*zone_size:zone_size], start=zone_row_idx_start):
-        row = []
-        for zone_col_idx, zone_col in enumerate(zone_row[::zone_size]):
-            if (zone_col_idx, zone_row_idx) == start_pos:
-                row.append('S')
-            elif (zone_col_idx, zone_row_idx) == end_pos:
-                row.append('E')
-            elif zone_col == grid.background_color:
-                row.append('X')
-            else:
-                row.append('-')
-        compressed_grid.append(row)
-    
-    return compressed_grid
-
+    passable = zones != grid.background_color
+    passable[start[1], start[0]] = passable[end[1], end[0]] = True
+    path = shortest_path(passable, start, end)
+    return path.moves() if path else []
 
 def group_by_similarity(objects: list[SubGrid]) -> Tuple[list[list[SubGrid]], str]:
     """Count objects by similarity, grouping similar objects together"""
     if not objects:
         return {}
     
-    groups = []
-    used = set()
-    
-    for i, obj in enumerate(objects):
-        if i in used:
-            continue
-            
-        group = [obj]
-        used.add(i)
-        
-        for j, other_obj in enumerate(objects):
-            if j in used:
-                continue
-            if obj.is_similar(other_obj):
-                group.append(other_obj)
-                used.add(j)
-        
-        groups.append(group)
+    # is_similar is an equivalence, so one pass bucketing by its key groups the objects
+    buckets: dict[tuple, list[SubGrid]] = {}
+    for obj in objects:
+        buckets.setdefault(obj.similarity_key(), []).append(obj)
+    groups = list(buckets.values())
 
     summary = "Similarity groups:\n"
     for i, group in enumerate(groups):
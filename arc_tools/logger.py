@@ -1,3 +1,4 @@
+from collections import deque
 import logging
 import os
 formatter = logging.Formatter('%(levelname)s: %(filename)s:%(lineno)d - %(message)s')
@@ -10,4 +11,32 @@ if DEBUG:
     logger.setLevel(logging.DEBUG)
 else:
     logger.setLevel(logging.INFO)
-logger.propagate = False
\ No newline at end of file
+logger.propagate = False
+
+class Tracer:
+    """
+    Opt-in ring buffer of structured events for tracing hot paths: each event is (name, fields) and nothing is
+    formatted, so callers guard with `if tracer.enabled` and pay one attribute check while tracing is off.
+    Enabled from the start with TRACE=1.
+    """
+    def __init__(self) -> None:
+        self.enabled = False
+        self.events: deque[tuple[str, dict]] = deque(maxlen=0)
+
+    def enable(self, size: int = 10000):
+        self.events = deque(self.events, maxlen=size)
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def record(self, name: str, **fields):
+        self.events.append((name, fields))
+
+    def clear(self):
+        self.events.clear()
+
+
+tracer = Tracer()
+if os.environ.get('TRACE', '0') == '1':
+    tracer.enable()
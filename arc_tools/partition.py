@@ -0,0 +1,90 @@
+from typing import NamedTuple
+import numpy as np
+
+from arc_tools.grid import Grid, GridPoint, GridRegion, SubGrid
+
+
+class Divider(NamedTuple):
+    # first and last of the adjacent rows or columns making up the divider
+    start: int
+    end: int
+    color: int
+
+
+def uniform_lines(values: np.ndarray, axis: int = 0, skip: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Per row (axis 0) or column (axis 1): whether its cells share one colour, and the colour of its first cell.
+    With skip, a mask over the cells of a line, the skipped cells are left out and a line needs two other cells.
+    """
+    lines = values if axis == 0 else values.T
+    if skip is None:
+        colors = lines[:, 0] if lines.shape[1] else np.zeros(len(lines), dtype=lines.dtype)
+        return (lines == colors[:, None]).all(axis=1) & (lines.shape[1] > 0), colors
+    keep = ~np.asarray(skip, dtype=bool)
+    colors = lines[:, keep.argmax()]
+    return ((lines == colors[:, None]) | ~keep).all(axis=1) & (keep.sum() >= 2), colors
+
+
+def _group(lines: np.ndarray, colors: np.ndarray) -> list[Divider]:
+    """Runs of adjacent divider lines of one colour."""
+    dividers: list[Divider] = []
+    for index in np.flatnonzero(lines).tolist():
+        color = colors[index].item()
+        if dividers and dividers[-1].end == index - 1 and dividers[-1].color == color:
+            dividers[-1] = dividers[-1]._replace(end=index)
+        else:
+            dividers.append(Divider(index, index, color))
+    return dividers
+
+
+def _spans(dividers: list[Divider], size: int) -> list[tuple[int, int]]:
+    """(first, last) of the non-empty stretches between dividers."""
+    bounds = [-1] + [edge for divider in dividers for edge in (divider.start, divider.end)] + [size]
+    return [(bounds[i] + 1, bounds[i + 1] - 1) for i in range(0, len(bounds), 2) if bounds[i + 1] - bounds[i] > 1]
+
+
+class Partition:
+    """
+    The lattice a grid's divider rows and columns cut it into.
+    cells[i][j] is a zero-copy SubGrid view of the part between row span i and column span j.
+    """
+    def __init__(self, grid: Grid, row_dividers: list[Divider], column_dividers: list[Divider]):
+        height, width = grid.data.shape
+        self.grid = grid
+        self.row_dividers = row_dividers
+        self.column_dividers = column_dividers
+        self.row_spans = _spans(row_dividers, height)
+        self.column_spans = _spans(column_dividers, width)
+        self.cells = [[SubGrid(GridRegion([GridPoint(x1, y1), GridPoint(x2, y2)]), grid) for x1, x2 in self.column_spans] for y1, y2 in self.row_spans]
+
+    def __repr__(self):
+        return f"Partition(rows={len(self.row_spans)}, columns={len(self.column_spans)})"
+
+
+def partition_grid(grid: Grid, colors: list[int] | None = None, include_background: bool = False) -> Partition:
+    """
+    Split grid along its uniform rows and columns of any colour (or of colors), adjacent lines of one colour
+    making one divider. A line crossed by dividers of the other direction only needs to be uniform between them,
+    so lattices whose crossings take the other divider's colour are found too.
+    """
+    values = grid.data.view(np.ndarray)
+
+    def dividers(uniform, line_colors):
+        allowed = uniform.copy()
+        if colors:
+            allowed &= np.isin(line_colors, colors)
+        if not include_background:
+            allowed &= line_colors != grid.background_color
+        return allowed
+
+    strict_rows, strict_row_colors = uniform_lines(values, 0)
+    strict_columns, strict_column_colors = uniform_lines(values, 1)
+    rows = dividers(strict_rows, strict_row_colors)
+    columns = dividers(strict_columns, strict_column_colors)
+    crossed_rows, crossed_row_colors = uniform_lines(values, 0, skip=columns)
+    crossed_columns, crossed_column_colors = uniform_lines(values, 1, skip=rows)
+    row_colors = np.where(rows, strict_row_colors, crossed_row_colors)
+    column_colors = np.where(columns, strict_column_colors, crossed_column_colors)
+    rows |= dividers(crossed_rows, crossed_row_colors)
+    columns |= dividers(crossed_columns, crossed_column_colors)
+    return Partition(grid, _group(rows, row_colors), _group(columns, column_colors))
@@ -0,0 +1,164 @@
+from collections import deque
+import heapq
+import numpy as np
+
+from arc_tools.grid import Grid
+
+# up, down, left, right, then the diagonals, as (dx, dy)
+_STEPS = [(0, -1), (0, 1), (-1, 0), (1, 0), (-1, -1), (1, -1), (-1, 1), (1, 1)]
+_MOVES = {
+    (0, -1): 'move_up', (0, 1): 'move_down', (-1, 0): 'move_left', (1, 0): 'move_right',
+    (-1, -1): 'move_up_left', (1, -1): 'move_up_right', (-1, 1): 'move_down_left', (1, 1): 'move_down_right',
+}
+
+
+class Path:
+    """A shortest path, kept as the parent pointers of its search and unrolled into cells only when asked for."""
+    def __init__(self, parents: np.ndarray, goal: int, width: int):
+        self._parents = parents
+        self._goal = goal
+        self._width = width
+        self._cells: list[tuple[int, int]] | None = None
+
+    @property
+    def cells(self) -> list[tuple[int, int]]:
+        """(x, y) of the cells from start to goal."""
+        if self._cells is None:
+            node, nodes = self._goal, [self._goal]
+            while self._parents[node] != node:
+                node = int(self._parents[node])
+                nodes.append(node)
+            self._cells = [(node % self._width, node // self._width) for node in reversed(nodes)]
+        return self._cells
+
+    def __len__(self):
+        """Number of steps."""
+        return len(self.cells) - 1
+
+    def moves(self) -> list[str]:
+        cells = self.cells
+        return [_MOVES[(x2 - x1, y2 - y1)] for (x1, y1), (x2, y2) in zip(cells, cells[1:])]
+
+
+def passable_mask(grid: Grid, passable: list[int] | None = None, blocked: list[int] | None = None) -> np.ndarray:
+    """Cells that can be walked on: those of the passable colours (default all) that are not of a blocked colour."""
+    values = grid.data.view(np.ndarray)
+    mask = np.isin(values, passable) if passable is not None else np.ones(values.shape, dtype=bool)
+    if blocked:
+        mask &= ~np.isin(values, blocked)
+    return mask
+
+
+def _cached(grid, key, compute):
+    """Result of compute for a Grid, kept until the grid next changes; masks are not cached."""
+    if not isinstance(grid, Grid):
+        return compute(grid)
+    cached = grid._paths
+    if cached is None or cached[0] != grid._version:
+        cached = grid._paths = (grid._version, {})
+    if key not in cached[1]:
+        cached[1][key] = compute(passable_mask(grid, *key[1]))
+    return cached[1][key]
+
+
+def _key(passable, blocked):
+    return (tuple(passable) if passable is not None else None, tuple(blocked) if blocked else None)
+
+
+def _bfs(mask: np.ndarray, start: tuple[int, int], goal: tuple[int, int], go_diagonal: bool) -> Path | None:
+    height, width = mask.shape
+    inside = lambda x, y: 0 <= x < width and 0 <= y < height
+    if not inside(*start) or not inside(*goal) or not mask[start[1], start[0]] or not mask[goal[1], goal[0]]:
+        return None
+    walkable = mask.ravel().tolist()
+    parents = np.full(height * width, -1, dtype=np.int64)
+    source, target = start[1] * width + start[0], goal[1] * width + goal[0]
+    parents[source] = source
+    steps = _STEPS if go_diagonal else _STEPS[:4]
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        if node == target:
+            return Path(parents, target, width)
+        y, x = divmod(node, width)
+        for dx, dy in steps:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height:
+                neighbour = ny * width + nx
+                if walkable[neighbour] and parents[neighbour] < 0:
+                    parents[neighbour] = node
+                    queue.append(neighbour)
+    return None
+
+
+def _astar(mask: np.ndarray, start: tuple[int, int], goal: tuple[int, int], go_diagonal: bool) -> Path | None:
+    height, width = mask.shape
+    inside = lambda x, y: 0 <= x < width and 0 <= y < height
+    if not inside(*start) or not inside(*goal) or not mask[start[1], start[0]] or not mask[goal[1], goal[0]]:
+        return None
+    gx, gy = goal
+    # Manhattan distance, or Chebyshev when diagonal steps cost one too
+    heuristic = (lambda x, y: max(abs(x - gx), abs(y - gy))) if go_diagonal else (lambda x, y: abs(x - gx) + abs(y - gy))
+    walkable = mask.ravel().tolist()
+    parents = np.full(height * width, -1, dtype=np.int64)
+    costs = {}
+    source, target = start[1] * width + start[0], goal[1] * width + goal[0]
+    parents[source] = source
+    costs[source] = 0
+    steps = _STEPS if go_diagonal else _STEPS[:4]
+    heap = [(heuristic(*start), 0, source)]
+    while heap:
+        _, cost, node = heapq.heappop(heap)
+        if node == target:
+            return Path(parents, target, width)
+        if cost > costs[node]:
+            continue
+        y, x = divmod(node, width)
+        for dx, dy in steps:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height:
+                neighbour = ny * width + nx
+                if walkable[neighbour] and cost + 1 < costs.get(neighbour, height * width):
+                    costs[neighbour] = cost + 1
+                    parents[neighbour] = node
+                    heapq.heappush(heap, (cost + 1 + heuristic(nx, ny), cost + 1, neighbour))
+    return None
+
+
+def shortest_path(grid: Grid | np.ndarray, start: tuple[int, int], goal: tuple[int, int], passable: list[int] | None = None, blocked: list[int] | None = None, go_diagonal: bool = False, method: str = 'bfs') -> Path | None:
+    """
+    Shortest path between the (x, y) cells start and goal over a Grid's passable cells or a boolean mask, or None.
+    'bfs' keeps one parent pointer per cell and expands up, down, left, right (then diagonals) in that order;
+    'astar' is guided by the Manhattan (Chebyshev with diagonals) distance to the goal.
+    Paths on a Grid are kept until it next changes.
+    """
+    search = {'bfs': _bfs, 'astar': _astar}[method]
+    (x1, y1), (x2, y2) = start, goal
+    key = ('path', _key(passable, blocked), (x1, y1), (x2, y2), go_diagonal, method)
+    return _cached(grid, key, lambda mask: search(mask, (x1, y1), (x2, y2), go_diagonal))
+
+
+def distance_map(grid: Grid | np.ndarray, sources: list[tuple[int, int]], passable: list[int] | None = None, blocked: list[int] | None = None, go_diagonal: bool = False) -> np.ndarray:
+    """
+    Steps from the nearest of the (x, y) sources to every cell over the passable cells, -1 where unreachable.
+    The frontier is grown one step at a time by shifting it over the whole mask.
+    """
+    def compute(mask):
+        height, width = mask.shape
+        distances = np.full(mask.shape, -1, dtype=np.int64)
+        frontier = np.zeros(mask.shape, dtype=bool)
+        for x, y in sources:
+            if 0 <= x < width and 0 <= y < height and mask[y, x]:
+                frontier[y, x] = True
+        step = 0
+        while frontier.any():
+            distances[frontier] = step
+            grown = frontier.copy()
+            for dx, dy in _STEPS if go_diagonal else _STEPS[:4]:
+                grown[max(dy, 0):height + min(dy, 0), max(dx, 0):width + min(dx, 0)] |= frontier[max(-dy, 0):height - max(dy, 0), max(-dx, 0):width - max(dx, 0)]
+            frontier = grown & mask & (distances < 0)
+            step += 1
+        distances.flags.writeable = False
+        return distances
+    key = ('distances', _key(passable, blocked), tuple(map(tuple, sources)), go_diagonal)
+    return _cached(grid, key, compute)
@@ -0,0 +1,116 @@
+from typing import NamedTuple
+import numpy as np
+
+from arc_tools.grid import Grid
+
+
+class Tile(NamedTuple):
+    grid: Grid
+    # share of the known cells the tile reproduces
+    confidence: float
+
+
+def minimal_period(items: list) -> int:
+    """Smallest p with items[i] == items[i + p] wherever both exist, from the prefix function of items."""
+    border = [0] * len(items)
+    k = 0
+    for i in range(1, len(items)):
+        while k and items[i] != items[k]:
+            k = border[k - 1]
+        if items[i] == items[k]:
+            k += 1
+        border[i] = k
+    return len(items) - border[-1] if items else 0
+
+
+def _fit(codes: np.ndarray, known: np.ndarray, color_count: int, height: int, width: int) -> tuple[np.ndarray, float]:
+    """Majority tile of height x width for the known cells and the share of them it reproduces."""
+    rows, cols = codes.shape
+    classes = (np.arange(rows)[:, None] % height * width + np.arange(cols)[None, :] % width)[known]
+    counts = np.bincount(classes * color_count + codes[known], minlength=height * width * color_count).reshape(height * width, color_count)
+    best = counts.argmax(axis=1)
+    best[~counts.any(axis=1)] = -1
+    total = int(known.sum())
+    return best.reshape(height, width), int(counts.max(axis=1).sum()) / total if total else 1.0
+
+
+def _conflicts(values: np.ndarray, known: np.ndarray) -> np.ndarray:
+    """
+    conflicts[dy, dx] counts the known cells whose known partner dy rows down and dx columns across (dx taken
+    modulo twice the width) holds another value, for 0 <= dy < rows: the autocorrelation of the known mask less
+    those of the colour masks, read from one zero-padded FFT per mask.
+    """
+    rows, cols = values.shape
+    shape = (2 * rows, 2 * cols)
+    power = np.abs(np.fft.rfft2(known.astype(float), shape)) ** 2
+    for color in np.unique(values[known]).tolist():
+        power -= np.abs(np.fft.rfft2(((values == color) & known).astype(float), shape)) ** 2
+    return np.rint(np.fft.irfft2(power, shape)[:rows]).astype(np.int64)
+
+
+def _exact_size(values: np.ndarray, known: np.ndarray) -> tuple[int, int]:
+    """Smallest height x width (by area, then height) at which no two known cells a whole number of tiles apart differ."""
+    rows, cols = values.shape
+    conflict = _conflicts(values, known) != 0
+    best = (rows * cols, rows, cols)
+    for height in range(1, rows + 1):
+        if height >= best[0]:
+            break
+        # offsets of one or more tiles down and any number of tiles across
+        below = conflict[height::height].any(axis=0)
+        for width in range(1, cols + 1):
+            if (height * width, height, width) >= best:
+                break
+            # only offsets of whole tiles are read, cols / width of them per row, O(cells * log(cells)) for all sizes
+            if not (conflict[0, width:cols:width].any() or below[0:cols:width].any() or below[2 * cols - width:cols:-width].any()):
+                best = (height * width, height, width)
+                break
+    return best[1], best[2]
+
+
+def find_tile(grid: Grid, mask_color: int | None = None, min_confidence: float = 1.0) -> Tile:
+    """
+    Smallest tile (by area) that repeats over the grid, cells of mask_color matching anything.
+    Without masked cells an exact tile is separable, so its height and width are the minimal periods of the row
+    and column sequences, found in O(cells). With them, a tile fits when no two known cells a whole number of
+    tiles apart differ: the differing pairs at every offset come from FFT autocorrelations of the colour masks in
+    O(colours * cells * log(cells)), and each candidate only reads its own multiples, O(cells * log(cells)) over
+    all candidates. Below min_confidence 1 each row and column period is voted on with one pass over the cells
+    and the surviving pairs are tried smallest first. A tile cell with no known value keeps mask_color.
+    """
+    values = grid.data.view(np.ndarray)
+    rows, cols = values.shape
+    if not values.size:
+        return Tile(grid.copy(), 1.0)
+    known = values != mask_color if mask_color is not None else np.ones(values.shape, dtype=bool)
+    if known.all() and min_confidence >= 1:
+        height = minimal_period([row.tobytes() for row in values])
+        width = minimal_period([column.tobytes() for column in values.T.copy()])
+        return Tile(Grid(values[:height, :width].tolist(), grid.background_color), 1.0)
+
+    colors, codes = np.unique(values, return_inverse=True)
+    codes = codes.reshape(values.shape)
+    if min_confidence >= 1:
+        sizes = [_exact_size(values, known)]
+    else:
+        heights = [h for h in range(1, rows + 1) if _fit(codes, known, len(colors), h, cols)[1] >= min_confidence]
+        widths = [w for w in range(1, cols + 1) if _fit(codes, known, len(colors), rows, w)[1] >= min_confidence]
+        sizes = sorted(((h, w) for h in heights for w in widths), key=lambda size: (size[0] * size[1], size))
+    for height, width in sizes:
+        best, confidence = _fit(codes, known, len(colors), height, width)
+        if confidence >= min_confidence:
+            tile = colors[np.maximum(best, 0)]
+            if mask_color is not None:
+                tile[best < 0] = mask_color
+            return Tile(Grid(tile.tolist(), grid.background_color), confidence)
+    return Tile(grid.copy(), 1.0)
+
+
+def complete_periodic(grid: Grid, mask_color: int | None = None, min_confidence: float = 1.0) -> Grid:
+    """The grid redrawn from its smallest tile, which fills the mask_color cells and overwrites cells that disagree."""
+    rows, cols = grid.data.shape
+    if not rows * cols:
+        return grid.copy()
+    tile = find_tile(grid, mask_color, min_confidence).grid.data.view(np.ndarray)
+    repeats = (-(-rows // tile.shape[0]), -(-cols // tile.shape[1]))
+    return Grid(np.tile(tile, repeats)[:rows, :cols].tolist(), grid.background_color)
@@ -1,11 +1,4 @@
-from matplotlib.backend_bases import MouseButton
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
 import numpy as np
-try:
-    import pyperclip
-except ImportError:
-    pyperclip = None
 from arc_tools.logger import logger
 from glob import glob
 import os
@@ -25,6 +18,9 @@ is_agent_terminal = (os.environ.get("IS_AGENT_TERMINAL") # standard
 IS_ARC_AGI_3 = False
 
 def plot_grid(grid: 'Grid', name="grid.png", show=1, close=True, ax=None, save=True, save_all=False, title=None):
+    # matplotlib is only loaded once something is plotted, so importing arc_tools stays cheap
+    import matplotlib.pyplot as plt
+    import matplotlib.colors as mcolors
     global plot_grid_count
     if name == "grid.png" and save_all:
         plot_grid_count += 1
@@ -113,6 +109,8 @@ def plot_grids(grids, name=None, show=1, save_all=False, titles=None):
     if len(grids) == 0:
         print("No grids to plot")
         return
+    import matplotlib.pyplot as plt
+    from matplotlib.backend_bases import MouseButton
     global plot_grids_count
     # plot the grids in a single plot
     fig, axs = plt.subplots(1, len(grids), figsize=(10, 5 * len(grids)))
@@ -153,8 +151,11 @@ def plot_grids(grids, name=None, show=1, save_all=False, titles=None):
                 col = int(event.xdata + 0.5)
                 row = int(event.ydata + 0.5)
                 copy_msg = f'(row,col) = ({row},{col})'
-                if pyperclip:
-                    pyperclip.copy(copy_msg)
+                try:
+                    import pyperclip
+                except ImportError:
+                    return
+                pyperclip.copy(copy_msg)
     plt.connect('button_press_event', on_click)
     if show and not disable_show and not is_agent_terminal:
         plt.show(block=1)
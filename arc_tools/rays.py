@@ -0,0 +1,112 @@
+from typing import NamedTuple
+import numpy as np
+
+
+class Ray(NamedTuple):
+    origin: tuple[int, int]
+    direction: tuple[int, int]
+    # (x, y) of the cells passed through in order, the origin left out
+    cells: list[tuple[int, int]]
+    # (x, y) of the obstacle cells struck in order: one per reflection, then the one that stopped the ray
+    hits: list[tuple[int, int]]
+    # number of reflections
+    bounces: int
+
+    @property
+    def hit(self) -> tuple[int, int] | None:
+        """Obstacle the ray ended on, or None when it left the grid."""
+        return self.hits[-1] if len(self.hits) > self.bounces else None
+
+
+def _line(x1: int, y1: int, x2: int, y2: int) -> tuple[np.ndarray, np.ndarray]:
+    """xs and ys of the cells of the Bresenham segment from (x1, y1) to (x2, y2), both ends included."""
+    dx, dy = x2 - x1, y2 - y1
+    steps = max(abs(dx), abs(dy))
+    if not steps:
+        return np.array([x1]), np.array([y1])
+    t = np.arange(steps + 1)
+    # each coordinate advances by |d| / steps per step, rounded half away from the start
+    xs = x1 + np.sign(dx) * ((2 * t * abs(dx) + steps) // (2 * steps))
+    ys = y1 + np.sign(dy) * ((2 * t * abs(dy) + steps) // (2 * steps))
+    return xs, ys
+
+
+def line_cells(start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
+    """(x, y) of the cells of the segment from start to end; horizontal, vertical and diagonal ones are exact."""
+    xs, ys = _line(*start, *end)
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def segment_cells(segments: list[tuple[tuple[int, int], tuple[int, int]]], width: int, height: int) -> tuple[np.ndarray, np.ndarray]:
+    """xs and ys of the cells of all the segments (start, end) that lie inside a width x height grid."""
+    if not segments:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    lines = [_line(*start, *end) for start, end in segments]
+    xs = np.concatenate([xs for xs, _ in lines])
+    ys = np.concatenate([ys for _, ys in lines])
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    return xs[inside], ys[inside]
+
+
+def _stops(blocked: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Whether each of the (xs, ys) cells is an obstacle or off the grid."""
+    height, width = blocked.shape
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    stops = ~inside
+    stops[inside] = blocked[ys[inside], xs[inside]]
+    return stops
+
+
+def cast_rays(blocked: np.ndarray, origins: list[tuple[int, int]], directions: list[tuple[int, int]], bounces: int = 0, max_length: int | None = None) -> list[Ray]:
+    """
+    One ray per origin and direction (origins x directions, origin-major) stepping from its (x, y) origin until
+    an obstacle (a True cell of blocked) or the border.
+    A ray is reflected up to bounces times: off a wall across its path it turns back along the blocked axis,
+    off a lone corner in its diagonal path it turns back along both.
+    All rays of a round are stepped at once over max_length (default the grid's larger side) cells.
+    """
+    height, width = blocked.shape
+    length = max_length if max_length is not None else max(height, width)
+    pairs = [((x, y), (dx, dy)) for x, y in origins for dx, dy in directions]
+    if not pairs:
+        return []
+    position = np.array([origin for origin, _ in pairs], dtype=np.int64).reshape(-1, 2)
+    heading = np.array([direction for _, direction in pairs], dtype=np.int64).reshape(-1, 2)
+    cells: list[list[tuple[int, int]]] = [[] for _ in pairs]
+    hits: list[list[tuple[int, int]]] = [[] for _ in pairs]
+    bounced = [0] * len(pairs)
+    active = np.flatnonzero(heading.any(axis=1))
+    steps = np.arange(1, length + 1)
+    for round_ in range(bounces + 1):
+        if not len(active):
+            break
+        # (ray, step, axis) positions of every active ray
+        path = position[active, None, :] + heading[active, None, :] * steps[None, :, None]
+        xs, ys = path[..., 0], path[..., 1]
+        stopped = _stops(blocked, xs, ys)
+        ends = np.where(stopped.any(axis=1), stopped.argmax(axis=1), length)
+        # stopped by an obstacle rather than the border
+        struck = np.zeros(len(active), dtype=bool)
+        rows = np.flatnonzero(ends < length)
+        end_x, end_y = xs[rows, ends[rows]], ys[rows, ends[rows]]
+        struck[rows] = (end_x >= 0) & (end_x < width) & (end_y >= 0) & (end_y < height)
+        for i, ray in enumerate(active.tolist()):
+            end = int(ends[i])
+            cells[ray].extend(zip(xs[i, :end].tolist(), ys[i, :end].tolist()))
+            if struck[i]:
+                hits[ray].append((int(xs[i, end]), int(ys[i, end])))
+        if round_ == bounces:
+            break
+        # reflect the rays that struck an obstacle from the last free cell before it
+        active, ends = active[struck], ends[struck]
+        position[active] += heading[active] * ends[:, None]
+        x, y = position[active, 0], position[active, 1]
+        dx, dy = heading[active, 0], heading[active, 1]
+        flip_x = (dx != 0) & _stops(blocked, x + dx, y)
+        flip_y = (dy != 0) & _stops(blocked, x, y + dy)
+        corner = ~flip_x & ~flip_y
+        heading[active, 0] = np.where(flip_x | corner, -dx, dx)
+        heading[active, 1] = np.where(flip_y | corner, -dy, dy)
+        for ray in active.tolist():
+            bounced[ray] += 1
+    return [Ray(origin, direction, ray_cells, ray_hits, count) for (origin, direction), ray_cells, ray_hits, count in zip(pairs, cells, hits, bounced)]
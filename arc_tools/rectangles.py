@@ -0,0 +1,107 @@
+import numpy as np
+
+
+class RectangleIndex:
+    """
+    Summed-area tables of a grid's cells, one per colour and one for the foreground, so the number of cells of a
+    colour in any rectangle is four lookups. Rectangles are (x1, y1, x2, y2) with inclusive, in-bounds corners.
+    """
+    def __init__(self, values: np.ndarray, background_color: int):
+        self.values = values
+        self.background_color = background_color
+        self.colors = np.unique(values).tolist()
+        height, width = values.shape
+        tables = np.zeros((len(self.colors), height + 1, width + 1), dtype=np.int32)
+        tables[:, 1:, 1:] = (values[None] == np.array(self.colors).reshape(-1, 1, 1)).cumsum(axis=1).cumsum(axis=2)
+        self._tables = dict(zip(self.colors, tables))
+        self._foreground = np.zeros((height + 1, width + 1), dtype=np.int32)
+        self._foreground[1:, 1:] = (values != background_color).cumsum(axis=0).cumsum(axis=1)
+        self._tilings: dict[tuple, list[tuple[int, int, int, int]]] = {}
+
+    def _table(self, colors: list[int] | None) -> np.ndarray:
+        """Summed-area table of the cells holding one of colors, or of the foreground."""
+        if colors is None:
+            return self._foreground
+        table = np.zeros_like(self._foreground)
+        for color in set(colors):
+            if color in self._tables:
+                table = table + self._tables[color]
+        return table
+
+    def count(self, x1: int, y1: int, x2: int, y2: int, color: int | None = None) -> int:
+        """Cells of color in the rectangle, or foreground cells when color is None."""
+        table = self._foreground if color is None else self._tables.get(color)
+        if table is None:
+            return 0
+        return int(table[y2 + 1, x2 + 1] - table[y1, x2 + 1] - table[y2 + 1, x1] + table[y1, x1])
+
+    def is_uniform(self, x1: int, y1: int, x2: int, y2: int) -> bool:
+        return self.count(x1, y1, x2, y2, self.values[y1, x1].item()) == (x2 - x1 + 1) * (y2 - y1 + 1)
+
+    def is_foreground(self, x1: int, y1: int, x2: int, y2: int) -> bool:
+        return self.count(x1, y1, x2, y2) == (x2 - x1 + 1) * (y2 - y1 + 1)
+
+    def window_counts(self, width: int, height: int, colors: list[int] | None = None) -> np.ndarray:
+        """counts[y, x] is the number of cells of colors (default the foreground) in the width x height window at (x, y)."""
+        table = self._table(colors)
+        return table[height:, width:] - table[:-height, width:] - table[height:, :-width] + table[:-height, :-width]
+
+    def maximal_uniform_rectangles(self, colors: list[int] | None = None, min_area: int = 1) -> list[tuple[int, int, int, int]]:
+        """
+        Every single-colour rectangle that cannot grow in any direction, sorted by top then left corner.
+        Each row is swept once with a stack of column heights; a rectangle closed on its bottom row is kept
+        unless the row below continues it.
+        """
+        height, width = self.values.shape
+        rectangles = []
+        for color in self.colors if colors is None else colors:
+            if color not in self._tables:
+                continue
+            mask = self.values == color
+            heights = np.zeros(width, dtype=np.int64)
+            for y in range(height):
+                heights = np.where(mask[y], heights + 1, 0)
+                stack: list[tuple[int, int]] = []
+                for x, h in enumerate(heights.tolist() + [0]):
+                    start = x
+                    while stack and stack[-1][1] > h:
+                        start, top = stack.pop()
+                        area = top * (x - start)
+                        if area >= min_area and (y + 1 == height or self.count(start, y + 1, x - 1, y + 1, color) < x - start):
+                            rectangles.append((start, y - top + 1, x - 1, y))
+                    if h and (not stack or stack[-1][1] < h):
+                        stack.append((start, h))
+        return sorted(rectangles, key=lambda box: (box[1], box[0], box[3], box[2]))
+
+    def square_tiling(self, size: int, required_colors: list[int] | None = None) -> list[tuple[int, int, int, int]]:
+        """
+        Greedy row-major tiling with non-overlapping size x size squares of foreground cells (or of required_colors)
+        whose first and last cells match, as split_into_square_boxes picks them. Covered cells read as background.
+        """
+        key = (size, tuple(required_colors) if required_colors else None)
+        if key in self._tilings:
+            return list(self._tilings[key])
+        height, width = self.values.shape
+        squares = []
+        if 0 < size <= min(height, width):
+            values = self.values
+            background = self.background_color
+            # with the background among required_colors, covered cells still count but read as background
+            background_good = required_colors is not None and background in required_colors
+            full = self.window_counts(size, size, required_colors or None) == size * size
+            if not background_good:
+                full &= values[:height - size + 1, :width - size + 1] == values[size - 1:, size - 1:]
+            # bottom[x] is the last row covered in column x by the squares placed so far
+            bottom = np.full(width, -1, dtype=np.int64)
+            for y, x in np.argwhere(full).tolist():
+                last = y + size - 1
+                if bottom[x:x + size].max() >= y and not background_good:
+                    continue
+                if background_good:
+                    first = background if bottom[x] >= y else values[y, x]
+                    if first != values[last, x + size - 1]:
+                        continue
+                squares.append((x, y, x + size - 1, last))
+                bottom[x:x + size] = last
+        self._tilings[key] = squares
+        return list(squares)
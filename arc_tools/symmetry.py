@@ -0,0 +1,107 @@
+from typing import NamedTuple
+import numpy as np
+
+
+class Symmetry(NamedTuple):
+    """
+    A mirror or rotation that maps the grid onto itself where both cells are known.
+    axis is in half-cell units: horizontal (a,) maps row y to a - y, vertical (a,) maps column x to a - x,
+    diagonal (d,) maps (x, y) to (y + d, x - d), anti_diagonal (s,) maps (x, y) to (s - y, s - x), and
+    rotational / rotational_90 (p, q) turn about the point (p / 2, q / 2) by 180 / 90 degrees clockwise.
+    """
+    kind: str
+    axis: tuple[int, ...]
+    # whether the axis or centre is the grid's own
+    centered: bool
+    # share of the cells whose image lies inside the grid
+    coverage: float
+    # (x, y) of the cells that differ from their image
+    violations: list[tuple[int, int]]
+
+
+def _image(kind: str, axis: tuple[int, ...], x: np.ndarray, y: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    if kind == 'horizontal':
+        return x, axis[0] - y
+    if kind == 'vertical':
+        return axis[0] - x, y
+    if kind == 'diagonal':
+        return y + axis[0], x - axis[0]
+    if kind == 'anti_diagonal':
+        return axis[0] - y, axis[0] - x
+    p, q = axis
+    if kind == 'rotational':
+        return p - x, q - y
+    return (p + q) // 2 - y, (q - p) // 2 + x
+
+
+# per kind, the partner of a mask whose full convolution with it counts the cell pairs of every axis (see _axes)
+_PAIRINGS = {
+    'horizontal': lambda a: a[..., ::-1],
+    'vertical': lambda a: a[..., ::-1, :],
+    'diagonal': lambda a: a.swapaxes(-1, -2)[..., ::-1, ::-1],
+    'anti_diagonal': lambda a: a.swapaxes(-1, -2),
+    'rotational': lambda a: a,
+    'rotational_90': lambda a: a.swapaxes(-1, -2)[..., ::-1],
+}
+
+
+def _axes(kind: str, height: int, width: int) -> list[tuple[tuple[int, ...], tuple[int, int], bool]]:
+    """(axis, index of its count in the full convolution, whether it is centred) of every candidate axis."""
+    if kind == 'horizontal':
+        return [((a,), (a, width - 1), a == height - 1) for a in range(2 * height - 1)]
+    if kind == 'vertical':
+        return [((a,), (height - 1, a), a == width - 1) for a in range(2 * width - 1)]
+    if kind == 'diagonal':
+        return [((d,), (width - 1 - d, height - 1 + d), 2 * d == width - height) for d in range(-(height - 1), width)]
+    if kind == 'anti_diagonal':
+        return [((s,), (s, s), 2 * s == width + height - 2) for s in range(height + width - 1)]
+    centres = [(p, q) for q in range(2 * height - 1) for p in range(2 * width - 1)]
+    if kind == 'rotational':
+        return [((p, q), (q, p), (p, q) == (width - 1, height - 1)) for p, q in centres]
+    return [((p, q), ((p + q) // 2, height - 1 - (q - p) // 2), (p, q) == (width - 1, height - 1)) for p, q in centres if (p + q) % 2 == 0]
+
+
+def _convolve(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Full 2-D convolution of each pair of stacked masks, through FFTs padded to powers of two."""
+    shape = (a.shape[-2] + b.shape[-2] - 1, a.shape[-1] + b.shape[-1] - 1)
+    padded = tuple(1 << (size - 1).bit_length() for size in shape)
+    product = np.fft.rfft2(a, padded) * np.fft.rfft2(b, padded)
+    return np.rint(np.fft.irfft2(product, padded)[..., :shape[0], :shape[1]]).astype(np.int64)
+
+
+def symmetry_report(values: np.ndarray, mask_color: int | None = None, tolerance: float = 0.0, min_coverage: float = 0.5) -> list[Symmetry]:
+    """
+    Every mirror and rotation, on- or off-centre, under which the grid maps onto itself with at most tolerance of
+    the compared cells differing. Cells of mask_color match anything, and axes whose image covers less than
+    min_coverage of the grid are skipped.
+    For each kind, the number of matching, compared and in-grid cell pairs of all candidate axes at once are
+    entries of one FFT convolution per colour mask, so only the axes that hold are visited cell by cell.
+    """
+    height, width = values.shape
+    if not values.size:
+        return []
+    known = values != mask_color if mask_color is not None else np.ones(values.shape, dtype=bool)
+    # all cells, known cells, then the known cells of each colour
+    masks = np.stack([np.ones(values.shape, dtype=bool), known] + [(values == color) & known for color in np.unique(values[known]).tolist()]).astype(float)
+    indices = np.indices(values.shape)
+    y, x = indices[0], indices[1]
+    report = []
+    for kind, partner in _PAIRINGS.items():
+        counts = _convolve(masks, partner(masks))
+        inside, compared, matching = counts[0], counts[1], counts[2:].sum(axis=0)
+        axes = _axes(kind, height, width)
+        rows, cols = np.array([index for _, index, _ in axes]).reshape(-1, 2).T
+        coverage = inside[rows, cols] / values.size
+        holds = (coverage >= min_coverage) & (compared[rows, cols] - matching[rows, cols] <= tolerance * compared[rows, cols])
+        for i in np.flatnonzero(holds).tolist():
+            axis, index, centered = axes[i]
+            violations = []
+            if compared[index] != matching[index]:
+                image_x, image_y = _image(kind, axis, x, y)
+                valid = (image_x >= 0) & (image_x < width) & (image_y >= 0) & (image_y < height) & known
+                ys, xs = y[valid], x[valid]
+                mirrored_y, mirrored_x = image_y[valid], image_x[valid]
+                differ = known[mirrored_y, mirrored_x] & (values[mirrored_y, mirrored_x] != values[ys, xs])
+                violations = sorted(zip(xs[differ].tolist(), ys[differ].tolist()), key=lambda cell: (cell[1], cell[0]))
+            report.append(Symmetry(kind, axis, centered, float(coverage[i]), violations))
+    return report
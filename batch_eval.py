@@ -0,0 +1,207 @@
+"""
+Evaluate every solved task in one go: python batch_eval.py [--suite v2|v1|all] [--workers N] [--timeout S] [--output results.csv]
+
+Solvers are imported once per worker process instead of once per task, every train and test pair with a known
+output is checked, and one row per task (pass/fail, pairs passed, wall time, error) is written as CSV, or as
+JSON when the output file ends in .json.
+"""
+import argparse
+import contextlib
+import csv
+import io
+import json
+import logging
+import os
+import re
+import signal
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SUITES = {
+    # tasks directory, data directories searched in order
+    'v2': ('evaluation_tasks', [os.path.join('..', 'ARC-AGI-2', 'data', 'evaluation'), os.path.join('..', 'ARC-AGI-2', 'data', 'training')]),
+    'v1': ('evaluation_tasks_v1', [os.path.join('..', 'ARC-AGI', 'data', 'evaluation')]),
+}
+FIELDS = ['suite', 'task_id', 'module', 'solver', 'status', 'passed', 'total', 'seconds', 'error']
+
+
+class Job(NamedTuple):
+    suite: str
+    task_id: str
+    module: str
+    solver: str
+    data_file: str | None
+    timeout: float
+
+
+def load_mapping(suite: str, root: str = ROOT) -> list[tuple[str, str, str]]:
+    """(task id, module, solver function) of every solved task of a suite."""
+    tasks_dir = os.path.join(root, SUITES[suite][0])
+    mapping = []
+    if suite == 'v2':
+        with open(os.path.join(tasks_dir, 'tasks.py')) as file:
+            imports = re.findall(r'^from (task_\d+) import (\w+)', file.read(), re.MULTILINE)
+        for module, solver in imports:
+            with open(os.path.join(tasks_dir, f'{module}.py'), encoding='utf-8') as file:
+                # every task file runs `python main.py <task id> <solver>` when executed
+                match = re.search(r'main\.py ([0-9a-f]{8})\b', file.read())
+            if match:
+                mapping.append((match.group(1), module, solver))
+    else:
+        with open(os.path.join(tasks_dir, 'task_mapping.txt')) as file:
+            for task_id, file_name in re.findall(r'Task ID:\s*(\w+);\s*File Name:\s*(\w+)\.py', file.read()):
+                if os.path.exists(os.path.join(tasks_dir, f'{file_name}.py')):
+                    mapping.append((task_id, file_name, 'solve'))
+    return mapping
+
+
+def find_data_file(suite: str, task_id: str, root: str = ROOT, data_dirs: list[str] | None = None) -> str | None:
+    for directory in data_dirs or SUITES[suite][1]:
+        path = os.path.join(root, directory, f'{task_id}.json')
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _init_worker(tasks_dir: str, work_dir: str):
+    os.environ['DISABLE_SHOW'] = '1'
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    for path in (ROOT, tasks_dir):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    # solvers save their plots to the working directory
+    os.chdir(work_dir)
+    # solvers set their own log levels on import, so silence logging as a whole
+    logging.disable(logging.CRITICAL)
+
+
+class _Timeout(BaseException):
+    # not an Exception, so solvers catching Exception cannot swallow it
+    pass
+
+
+def _alarm(signum, frame):
+    raise _Timeout()
+
+
+def _as_rows(output) -> list:
+    import numpy as np
+    return np.asarray(output).tolist()
+
+
+def _row(job: Job, status: str = 'error', error: str = '') -> dict:
+    return {'suite': job.suite, 'task_id': job.task_id, 'module': job.module, 'solver': job.solver,
+            'status': status, 'passed': 0, 'total': 0, 'seconds': 0.0, 'error': error}
+
+
+def evaluate(job: Job) -> dict:
+    """Run the job's solver on every pair of its task with a known output, in this process."""
+    import importlib
+    from arc_tools.grid import Grid
+
+    if job.data_file is None:
+        return _row(job, 'missing', 'task data not found')
+    row = _row(job)
+    with open(job.data_file) as file:
+        data = json.load(file)
+    pairs = [pair for pair in data['train'] + data['test'] if 'output' in pair]
+    row['total'] = len(pairs)
+    timed = hasattr(signal, 'SIGALRM') and job.timeout > 0
+    start = time.perf_counter()
+    try:
+        if timed:
+            signal.signal(signal.SIGALRM, _alarm)
+            signal.setitimer(signal.ITIMER_REAL, job.timeout)
+        # solvers print and some run code at import time; keep it out of the table
+        with contextlib.redirect_stdout(io.StringIO()):
+            solver = getattr(importlib.import_module(job.module), job.solver)
+            for pair in pairs:
+                if _as_rows(solver(Grid(pair['input']))) == pair['output']:
+                    row['passed'] += 1
+        row['status'] = 'pass' if row['passed'] == row['total'] else 'fail'
+    except _Timeout:
+        row['status'], row['error'] = 'timeout', f'over {job.timeout}s'
+    except (Exception, SystemExit) as error:
+        row['error'] = f'{type(error).__name__}: {error}'[:200]
+    finally:
+        if timed:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    row['seconds'] = round(time.perf_counter() - start, 4)
+    return row
+
+
+def run_suite(suite: str, workers: int | None = None, timeout: float = 10.0, data_dirs: list[str] | None = None) -> list[dict]:
+    """Evaluate every solved task of a suite across a process pool; rows come back in mapping order."""
+    tasks_dir = os.path.join(ROOT, SUITES[suite][0])
+    jobs = [Job(suite, task_id, module, solver, find_data_file(suite, task_id, data_dirs=data_dirs), timeout)
+            for task_id, module, solver in load_mapping(suite)]
+    rows: list[dict | None] = [None] * len(jobs)
+    pending = list(range(len(jobs)))
+    # after a worker dies the jobs it took down are rerun on one worker, where the first lost job is the culprit
+    isolate = False
+    with tempfile.TemporaryDirectory() as work_dir:
+        while pending:
+            lost = []
+            # one suite per pool: both suites have task_N modules and a helper module of their own
+            with ProcessPoolExecutor(max_workers=1 if isolate else workers, initializer=_init_worker, initargs=(tasks_dir, work_dir)) as pool:
+                futures = {pool.submit(evaluate, jobs[i]): i for i in pending}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        rows[i] = future.result()
+                    except BrokenProcessPool:
+                        lost.append(i)
+                    except Exception as error:
+                        rows[i] = _row(jobs[i], error=f'{type(error).__name__}: {error}'[:200])
+            lost.sort()
+            if lost and isolate:
+                # e.g. a solver exhausted memory or exited the process
+                rows[lost[0]] = _row(jobs[lost[0]], error='worker process died')
+                lost = lost[1:]
+            isolate = bool(lost) and not isolate
+            pending = lost
+    return rows
+
+
+def write_rows(rows: list[dict], output: str | None):
+    if output and output.endswith('.json'):
+        with open(output, 'w') as file:
+            json.dump(rows, file, indent=1)
+        return
+    file = open(output, 'w', newline='') if output else sys.stdout
+    try:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if output:
+            file.close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Evaluate every solved task across a process pool.')
+    parser.add_argument('--suite', choices=['v2', 'v1', 'all'], default='all')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='seconds per task, 0 for none')
+    parser.add_argument('--data', action='append', help='directory holding <task id>.json files, searched before the defaults')
+    parser.add_argument('--output', help='CSV file, or JSON when it ends in .json (default: CSV on stdout)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    rows = []
+    for suite in (['v2', 'v1'] if args.suite == 'all' else [args.suite]):
+        data_dirs = [os.path.abspath(path) for path in args.data] + SUITES[suite][1] if args.data else None
+        rows += run_suite(suite, args.workers, args.timeout, data_dirs)
+    write_rows(rows, args.output)
+    counts = {status: sum(row['status'] == status for row in rows) for status in ('pass', 'fail', 'error', 'timeout', 'missing')}
+    print(f"{len(rows)} tasks in {time.perf_counter() - start:.1f}s: " + ', '.join(f'{count} {status}' for status, count in counts.items()), file=sys.stderr)
+    return 0 if counts['pass'] == len(rows) - counts['missing'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,7 @@
 from collections import Counter
+import numpy as np
 from arc_tools.grid import Color
+from arc_tools.partition import uniform_lines
 from arc_tools.logger import logger
 
 def project_lines_with_gaps(grid):
@@ -11,24 +13,18 @@ def project_lines_with_gaps(grid):
     If the left region is empty, transfer the right region to the left region.
     '''
     # Find the vertical line divider (column with all same color)
-    divider_col = None
-    divider_color = None
-    direction = 1
-    for col in range(len(grid[0])):
-        col_colors = set(grid[row][col] for row in range(len(grid)))
-        empty_col = col_colors == {Color.BLACK.value}
-        if len(col_colors) == 1 and not empty_col:  # All pixels in this column are same color
-            divider_col = col
-            divider_color = list(col_colors)[0]
-            logger.debug(f"Found divider at column {divider_col} with color {divider_color}; direction: {direction}")
-            break
-        
-        direction = -1 if empty_col else 1
-
+    uniform, colors = uniform_lines(grid.data.view(np.ndarray), axis=1)
+    empty = uniform & (colors == Color.BLACK.value)
+    dividers = np.flatnonzero(uniform & ~empty)
+    divider_col = int(dividers[0]) if len(dividers) else None
+    divider_color = int(colors[divider_col]) if divider_col is not None else None
+    # the side of the divider the empty region lies on
+    direction = -1 if divider_col and empty[divider_col - 1] else 1
 
     if divider_col is None:
         logger.warning("No vertical divider line found")
         return grid
+    logger.debug(f"Found divider at column {divider_col} with color {divider_color}; direction: {direction}")
     
     # Create a copy of the grid to modify
     result = grid.copy()
@@ -2,12 +2,7 @@ import json
 from arc_tools.grid import Grid, GridRegion, GridPoint, flip_horizontally
 
 def check_subgrid(grid: Grid, full_grid: Grid) -> bool:
-    for big_row in range(full_grid.height - grid.height + 1):
-        for big_col in range(full_grid.width - grid.width + 1):
-            subgrid = full_grid.crop(GridRegion([GridPoint(big_col, big_row), GridPoint(big_col + grid.width - 1, big_row + grid.height - 1)]))
-            if subgrid == grid:
-                return True
-    return False
+    return bool(full_grid.find_template(grid))
 
 def extrapolation(grid: Grid) -> Grid:
     """ 
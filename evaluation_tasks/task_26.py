@@ -57,19 +57,7 @@ def connect_the_dots(grid: Grid):
                 # Only connect if dots are aligned (horizontal, vertical, or diagonal)
                 if dx == 0 or dy == 0 or abs(dx) == abs(dy):
                     # Connect these dots with a line
-                    steps = max(abs(dx), abs(dy))
-                    
-                    # Calculate step size for x and y
-                    step_x = dx / steps if steps > 0 else 0
-                    step_y = dy / steps if steps > 0 else 0
-                    
-                    # Draw the line
-                    for step in range(steps + 1):
-                        x = int(dot1.x + step * step_x)
-                        y = int(dot1.y + step * step_y)
-                        # Make sure we're not drawing outside the grid
-                        if 0 <= x < grid.width and 0 <= y < grid.height:
-                            result_grid[y][x] = color
+                    result_grid.draw_line((dot1.x, dot1.y), (dot2.x, dot2.y), color)
     
     for single_dot in single_dots:
         # check it's nearby dot
@@ -100,4 +88,4 @@ def connect_the_dots(grid: Grid):
 if __name__ == "__main__":
     os.environ['initial_file'] = os.path.splitext(os.path.basename(__file__))[0]
     os.system("python main.py 35ab12c3 connect_the_dots")
-    
\ No newline at end of file
+    
@@ -1,6 +1,8 @@
 # optimize
 import os
+import numpy as np
 from arc_tools.grid import Grid, detect_objects, GridPoint, place_object_on_new_grid
+from arc_tools.partition import uniform_lines
 
 def race(grid: Grid):
     '''
@@ -15,14 +17,8 @@ def race(grid: Grid):
     last_movement_direction = None
     
     # Find vertical divider columns
-    divider_cols = []
-    for col in range(width):
-        column_colors = [grid[row][col] for row in range(height)]
-        unique_colors = set(column_colors)
-        if len(unique_colors) == 1:
-            color = list(unique_colors)[0]
-            if color != background_color:
-                divider_cols.append(col)
+    uniform, colors = uniform_lines(grid.data.view(np.ndarray), axis=1)
+    divider_cols = np.flatnonzero(uniform & (colors != background_color)).tolist()
     
     if len(divider_cols) == 0:
         first_section = grid
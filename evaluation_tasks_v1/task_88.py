@@ -1,5 +1,6 @@
 import os
 from arc_tools.grid import Grid
+from arc_tools.partition import partition_grid
 from arc_tools import logger
 from helper import solve_task
 
@@ -15,29 +16,19 @@ def solve(grid: Grid):
     Rows 0 and 2 are typically all zeros or constant.
     '''
     width = len(grid[0])
+    # first row of each of the 4 sections between the gray dividers
+    starts = [start for start, _ in partition_grid(grid, colors=[5]).row_spans]
+    if len(starts) == 1:
+        # no dividers: sections of 3 rows and a divider row
+        starts = [0, 4, 8, 12]
 
     # Extract the middle row from each of the 4 sections
-    middle_rows = [
-        [grid[1][col] for col in range(width)],   # Section 0, row 1
-        [grid[5][col] for col in range(width)],   # Section 1, row 5
-        [grid[9][col] for col in range(width)],   # Section 2, row 9
-        [grid[13][col] for col in range(width)]   # Section 3, row 13
-    ]
+    middle_rows = [[grid[start + 1][col] for col in range(width)] for start in starts]
 
     # Also get the top/bottom rows to check if they have patterns
-    top_rows = [
-        [grid[0][col] for col in range(width)],
-        [grid[4][col] for col in range(width)],
-        [grid[8][col] for col in range(width)],
-        [grid[12][col] for col in range(width)]
-    ]
-
-    bottom_rows = [
-        [grid[2][col] for col in range(width)],
-        [grid[6][col] for col in range(width)],
-        [grid[10][col] for col in range(width)],
-        [grid[14][col] for col in range(width)]
-    ]
+    top_rows = [[grid[start][col] for col in range(width)] for start in starts]
+
+    bottom_rows = [[grid[start + 2][col] for col in range(width)] for start in starts]
 
     # Predict the next row for each position
     predicted_top = predict_next_row(top_rows)
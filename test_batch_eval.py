@@ -0,0 +1,34 @@
+import json
+
+from batch_eval import load_mapping, run_suite
+
+
+def test_run_suite(tmp_path):
+    assert ('00576224', 'task_1', 'solve') in load_mapping('v1')
+    assert ('1ae2feb7', 'task_1', 'project_lines_with_gaps') in load_mapping('v2')
+    task = {'train': [{'input': [[1, 2], [3, 4]], 'output': [[1, 2, 1, 2, 1, 2], [3, 4, 3, 4, 3, 4], [2, 1, 2, 1, 2, 1], [4, 3, 4, 3, 4, 3], [1, 2, 1, 2, 1, 2], [3, 4, 3, 4, 3, 4]]}],
+            'test': [{'input': [[5, 6], [7, 8]], 'output': [[0]]}]}
+    (tmp_path / '00576224.json').write_text(json.dumps(task))
+    rows = {row['task_id']: row for row in run_suite('v1', workers=1, timeout=5, data_dirs=[str(tmp_path)])}
+    assert rows['00576224']['status'] == 'fail' and (rows['00576224']['passed'], rows['00576224']['total']) == (1, 2)
+    assert rows['009d5c81']['status'] == 'missing'
+
+
+def test_run_suite_survives_crashes_and_broad_excepts(tmp_path, monkeypatch):
+    import batch_eval
+    solvers = {
+        'task_1': 'import os\ndef solve(grid):\n    os._exit(1)\n',
+        # solvers that catch Exception must still time out
+        'task_2': 'import time\ndef solve(grid):\n    while True:\n        try:\n            time.sleep(1)\n        except Exception:\n            pass\n',
+        'task_3': 'def solve(grid):\n    return grid\n',
+    }
+    mapping = ''
+    for i, (module, source) in enumerate(solvers.items()):
+        (tmp_path / f'{module}.py').write_text(source)
+        (tmp_path / f'0000000{i}.json').write_text(json.dumps({'train': [{'input': [[1]], 'output': [[1]]}], 'test': []}))
+        mapping += f'Task ID: 0000000{i}; File Name: {module}.py\n'
+    (tmp_path / 'task_mapping.txt').write_text(mapping)
+    monkeypatch.setitem(batch_eval.SUITES, 'fake', (str(tmp_path), [str(tmp_path)]))
+    rows = run_suite('fake', workers=2, timeout=0.5)
+    assert [(row['module'], row['status']) for row in rows] == [('task_1', 'error'), ('task_2', 'timeout'), ('task_3', 'pass')]
+    assert rows[0]['error'] == 'worker process died'
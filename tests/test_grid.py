@@ -1,6 +1,7 @@
-from arc_tools.grid import detect_objects, split_into_square_boxes, move_object
-from arc_tools.grid import Grid, GridRegion, GridPoint
+from arc_tools.grid import detect_objects, label_objects, split_into_square_boxes, move_object, place_object_on_new_grid
+from arc_tools.grid import Grid, GridRegion, GridPoint, SubGrid
 from arc_tools.plot import plot_grids
+import numpy as np
 def test_grid_with_hollow():
     grid_with_hollow = [
         [0, 0, 1, 0, 0],
@@ -111,6 +112,382 @@ def test_move_object():
     grid.display()
     plot_grids([initial_grid, grid], show=True)
 
+def test_grid_data_sync():
+    grid = Grid([[0, 1, 2], [3, 4, 5]])
+    data = grid.data
+    assert data.dtype == np.int8
+    grid[0][1] = 9
+    assert data[0, 1] == 9
+    grid.data[1, 2] = 7
+    assert grid[1][2] == 7
+    grid.data[:, 0] = 8
+    assert grid == [[8, 9, 2], [8, 4, 7]]
+    grid.append([1, 1, 1])
+    assert grid.data.shape == (3, 3)
+    assert grid[5] == [] and grid[0][5] == []
+    # values the dtype cannot hold widen the array whichever way they are written
+    grid.data[0, 0] = 200
+    grid[1][1] = 300
+    assert grid.data.tolist() == [[200, 9, 2], [8, 300, 7], [1, 1, 1]]
+    ragged = Grid([[1, 2, 0], [1, 0]], 0)
+    assert ragged.data.tolist() == [[1, 2, 0], [1, 0, []]]
+    ragged.data[...] = 3
+    assert ragged == [[3, 3, 3], [3, 3]]
+
+def test_subgrid_past_parent_edge():
+    grid = Grid([[1, 1, 0], [1, 0, 1], [1, 1, 1]], 0)
+    obj = SubGrid(GridRegion([GridPoint(-1, 0), GridPoint(1, 2)]), grid)
+    # cells off the parent read [], so the cell array holds objects
+    assert obj.data.tolist() == [[[], 1, 1], [[], 1, 0], [[], 1, 1]]
+    assert obj.flatten_list() == [[], 1, 1, [], 1, 0, [], 1, 1] and obj.get_frame().data.tolist() == [[0, 0, 0]] * 3
+    assert obj.transformed('rotate').tolist() == [[[], [], []], [1, 1, 1], [1, 0, 1]]
+    assert obj.is_similar(obj.copy()) and not obj.is_similar(Grid([[1]]))
+    assert obj.get_holes_count() == 0
+    placed = Grid([[0] * 4 for _ in range(4)], 0)
+    place_object_on_new_grid(obj, 1, 1, placed)
+    assert placed[1] == [0, [], 1, 1]
+    assert grid.remove_object(obj) == [[0, 0, 0], [0, 0, 1], [0, 0, 1]]
+
+def test_grid_lazy_attributes():
+    grid = Grid([[0, 0, 0], [0, 1, 0], [0, 0, 0]])
+    assert grid.colors == (1,) and grid.color == 1
+    for row in range(3):
+        for col in range(2):
+            grid[row][col] = 2
+    # the background is the one detected on the grid as constructed
+    assert grid.background_color == 0
+    assert grid.colors == (2,) and grid.color == 2
+    grid.replace_color(2, 3)
+    assert grid.colors == (3,)
+    grid.extend_grid(4, 3)
+    assert grid.height == 4 and grid[3] == [0, 0, 0]
+
+def test_subgrid_view():
+    grid = Grid([
+        [0, 0, 0, 0],
+        [0, 1, 2, 0],
+        [0, 1, 1, 0],
+        [0, 0, 0, 0],
+    ])
+    sub = SubGrid(GridRegion([GridPoint(1, 1), GridPoint(2, 2)]), grid, obj_color=1)
+    assert sub.data.tolist() == [[1, 0], [1, 1]]
+    grid[1][1] = 5
+    assert [list(row) for row in sub] == [[1, 0], [1, 1]]
+    assert sub.get_full_grid()[2] == [0, 1, 1, 0]
+
+
+def test_subgrid_copy():
+    grid = Grid([
+        [0, 0, 0],
+        [0, 3, 3],
+        [0, 3, 0],
+    ])
+    obj = detect_objects(grid)[0]
+    copied = obj.copy()
+    copied.region.x1 += 1
+    assert obj.region.x1 == 1
+    grid[1][1] = 4
+    assert copied[0][0] == 3
+    assert copied.parent_grid[1][1] == 3
+    copied.parent_grid[2][2] = 5
+    assert grid[2][2] == 0
+
+
+def test_subgrid_copy_keeps_derived_data_apart():
+    grid = Grid([
+        [0, 0, 0],
+        [0, 1, 1],
+        [0, 1, 2],
+    ], 0)
+    obj = detect_objects(grid)[0]
+    obj.rotate()
+    obj.get_values_count()
+    copied = obj.copy()
+    obj[0][0] = 9
+    assert copied.rotate().data.tolist() == [[1, 1], [2, 1]]
+    assert copied.get_values_count() == {1: 3, 2: 1}
+    copied[0][0] = 3
+    assert obj.get_values_count() == {9: 1, 1: 2, 2: 1}
+    assert obj.rotate().data.tolist() == [[1, 9], [2, 1]]
+
+
+def test_label_objects():
+    grid = Grid([
+        [1, 1, 0, 2],
+        [0, 1, 0, 2],
+        [3, 0, 0, 0],
+    ])
+    components = label_objects(grid, go_diagonal=False)
+    assert components.count == 3
+    assert components.boxes.tolist() == [[0, 0, 1, 1], [3, 0, 3, 1], [0, 2, 0, 2]]
+    assert components.sizes.tolist() == [3, 2, 1]
+    assert components.colors.tolist() == [1, 2, 3]
+    assert label_objects(grid).count == 2
+    assert label_objects(grid, ignore_corners=True).count == 0
+    objects = detect_objects(grid, go_diagonal=False)
+    assert [(p.x, p.y, p.value) for p in objects[0].points] == [(0, 0, 1), (1, 0, 1), (1, 1, 1)]
+    extremes = objects[0].get_extreme_points()
+    assert [(p.x, p.y) for p in extremes.values()] == [(0, 0), (1, 0), (0, 0), (1, 1)]
+
+
+def test_detect_objects_cache():
+    from arc_tools.cache import enable_cache, disable_cache, cache_info
+    enable_cache(maxsize=2)
+    try:
+        rows = [[0, 1, 0], [0, 1, 0], [2, 0, 0]]
+        first = detect_objects(Grid(rows))
+        first[0].replace_color(1, 5, replace_in_parent_grid=False)
+        grid = Grid(rows)
+        second = detect_objects(grid)
+        assert cache_info().hits == 1
+        assert second[0][0][1] == 1 and second[0].parent_grid is grid
+        assert Grid(rows).is_similar(Grid(rows))
+        assert Grid(rows).shrink(1) is not None
+        hits = cache_info().hits
+        counts = Grid(rows, 0).get_values_count()
+        counts[1] = 9
+        assert Grid(rows, 0).get_values_count() == {1: 2, 2: 1}
+        assert Grid(rows, 0).get_holes_count() == Grid(rows, 0).get_holes_count() == 0
+        assert cache_info().hits == hits + 2
+        assert cache_info().evictions >= 1
+    finally:
+        disable_cache()
+
+
+def test_grid_version():
+    grid = Grid([[0, 1], [1, 0]])
+    digest = hash(grid)
+    grid[0][0] = 2
+    assert hash(grid) != digest and hash(grid) == hash(Grid([[2, 1], [1, 0]], 0))
+    digest = hash(grid)
+    grid.data[1, 1] = 3
+    assert hash(grid) != digest
+    digest = hash(grid)
+    grid.append([0, 0])
+    assert hash(grid) != digest and hash(grid) == hash(Grid([[2, 1], [1, 3], [0, 0]], 0))
+    objects = detect_objects(grid)
+    assert objects[0] == detect_objects(grid)[0]
+
+
+def test_transform():
+    grid = Grid([[1, 2, 3], [4, 5, 6]])
+    assert grid.rotate() == [[4, 1], [5, 2], [6, 3]]
+    assert grid.anti_rotate() == [[3, 6], [2, 5], [1, 4]]
+    assert grid.transform('transpose') == [[1, 4], [2, 5], [3, 6]]
+    assert grid.transform('anti_transpose') == [[6, 3], [5, 2], [4, 1]]
+    assert grid.flip_horizontally() == [[4, 5, 6], [1, 2, 3]]
+    assert grid.flip_vertically() == [[3, 2, 1], [6, 5, 4]]
+    assert grid.is_similar(grid.rotate().rotate())
+    grid.data[0, 0] = 7
+    assert grid.transformed('rotate').tolist() == [[4, 7], [5, 2], [6, 3]]
+    assert not Grid([[0, 1]]).is_similar(Grid([[0, 0]]), ignore_color=True)
+
+
+def test_group_by_similarity():
+    from arc_tools.helper import group_by_similarity
+    grid = Grid([
+        [1, 0, 1, 1],
+        [1, 0, 0, 0],
+        [0, 0, 0, 2],
+    ])
+    groups, _ = group_by_similarity(detect_objects(grid, single_color_only=True))
+    assert [len(group) for group in groups] == [2, 1]
+    assert grid.similarity_key() == grid.rotate().similarity_key()
+
+
+def test_values_count_histogram():
+    grid = Grid([[0, 1, 0], [2, 0, 1]])
+    assert list(grid.get_values_count(all=True).items()) == [(0, 3), (1, 2), (2, 1)]
+    grid[0][1] = 2
+    grid.data[1, 2] = 3
+    assert list(grid.get_values_count().items()) == [(2, 2), (3, 1)]
+    assert grid.get_unique_values() == (2, 3)
+    assert grid.get_total_dots() == 3 and grid.get_background_dots_count() == 3
+
+
+def test_get_holes():
+    grid = Grid([
+        [0, 1, 1, 1, 0, 0],
+        [0, 1, 0, 1, 0, 0],
+        [0, 1, 1, 1, 2, 2],
+        [0, 0, 0, 0, 2, 0],
+        [0, 0, 0, 0, 2, 2],
+    ])
+    holes = grid.get_holes()
+    assert grid.get_holes_count() == 1 and grid.get_holes_count(max_count=1) == 1
+    assert holes.sizes.tolist() == [1] and holes.boxes.tolist() == [[2, 1, 2, 1]]
+    assert holes.enclosing.tolist() == [0]
+    grid[1][2] = 1
+    assert grid.get_holes_count() == 0
+
+
+def test_shrink_and_resample():
+    grid = Grid([[1, 2, 3]]).enlarge(2)
+    assert grid == Grid([[1, 1, 2, 2, 3, 3], [1, 1, 2, 2, 3, 3]])
+    assert grid.shrink() == Grid([[1, 2, 3]])
+    assert grid.resample(1, 2, 'majority') == Grid([[1, 3]])
+    assert grid.resample(2, 3) == Grid([[1, 2, 3], [1, 2, 3]])
+
+
+def test_rectangle_index():
+    grid = Grid([
+        [1, 1, 0],
+        [1, 1, 2],
+        [0, 2, 2],
+    ], background_color=0)
+    index = grid.rectangle_index()
+    assert index.is_uniform(0, 0, 1, 1) and not index.is_uniform(0, 0, 2, 1)
+    assert index.is_foreground(1, 1, 2, 1) and index.count(0, 0, 2, 2, color=2) == 3
+    assert index.maximal_uniform_rectangles(colors=[2]) == [(2, 1, 2, 2), (1, 2, 2, 2)]
+    assert index.square_tiling(2) == [(0, 0, 1, 1)]
+
+
+def test_find_tile():
+    from arc_tools.periodicity import find_tile, complete_periodic
+    grid = Grid([
+        [1, 2, 1, 2, 1],
+        [3, 4, 3, 4, 3],
+        [1, 2, 1, 2, 1],
+    ])
+    assert find_tile(grid).grid == Grid([[1, 2], [3, 4]])
+    grid[1][2] = 0
+    tile = find_tile(grid, mask_color=0)
+    assert tile.grid == Grid([[1, 2], [3, 4]]) and tile.confidence == 1.0
+    assert complete_periodic(grid, mask_color=0)[1] == [3, 4, 3, 4, 3]
+
+
+def test_find_template():
+    from arc_tools.grid import Transform
+    grid = Grid([
+        [0, 0, 0, 0],
+        [0, 1, 2, 0],
+        [0, 0, 0, 1],
+        [0, 0, 0, 2],
+    ])
+    matches = grid.find_template([[1, 2]])
+    assert [(m.region.x1, m.region.y1) for m in matches] == [(1, 1)]
+    matches = grid.find_template([[1, 2]], transforms=True)
+    assert [(m.region.x1, m.region.y1, m.transform) for m in matches] == [(1, 1, Transform.IDENTITY), (3, 2, Transform.ROTATE)]
+    assert len(grid.find_template(Grid([[5], [5]], 0), ignore_color=True)) == 1
+
+
+def test_symmetry_report():
+    grid = Grid([
+        [1, 2, 1, 5],
+        [3, 4, 3, 5],
+        [1, 2, 1, 5],
+    ])
+    report = {(s.kind, s.axis): s for s in grid.symmetry_report()}
+    assert report[('horizontal', (2,))].centered
+    assert not report[('vertical', (2,))].centered and report[('vertical', (2,))].coverage == 0.75
+    grid[2][0] = 7
+    vertical = [s for s in grid.symmetry_report(tolerance=0.25) if s.kind == 'vertical' and s.axis == (2,)][0]
+    assert vertical.violations == [(0, 2), (2, 2)]
+
+
+def test_partition_grid():
+    from arc_tools.partition import partition_grid
+    grid = Grid([
+        [0, 0, 5, 0, 0],
+        [0, 1, 5, 2, 0],
+        [8, 8, 8, 8, 8],
+        [0, 3, 5, 0, 0],
+        [0, 0, 5, 0, 4],
+    ], 0)
+    partition = partition_grid(grid)
+    assert [(d.start, d.end, d.color) for d in partition.row_dividers] == [(2, 2, 8)]
+    assert [(d.start, d.end, d.color) for d in partition.column_dividers] == [(2, 2, 5)]
+    assert partition.cells[1][1].region == GridRegion([GridPoint(3, 3), GridPoint(4, 4)])
+    assert partition.cells[1][1].data.tolist() == [[0, 0], [0, 4]] and partition.cells[0][1].data.tolist() == [[0, 0], [2, 0]]
+
+
+def test_shortest_path():
+    from arc_tools.pathfinding import shortest_path, distance_map
+    grid = Grid([
+        [0, 0, 0],
+        [1, 1, 0],
+        [0, 0, 0],
+    ], 0)
+    path = shortest_path(grid, (0, 0), (0, 2), blocked=[1])
+    assert path.moves() == ['move_right', 'move_right', 'move_down', 'move_down', 'move_left', 'move_left']
+    assert shortest_path(grid, (0, 0), (0, 2), blocked=[1], method='astar').cells[-1] == (0, 2)
+    assert shortest_path(grid, (0, 0), (0, 2), blocked=[1]) is path
+    assert distance_map(grid, [(0, 0)], blocked=[1])[2].tolist() == [6, 5, 4]
+    grid[1][1] = 0
+    assert len(shortest_path(grid, (0, 0), (0, 2), blocked=[1])) == 4
+
+
+def test_cast_rays_and_draw_line():
+    grid = Grid([
+        [0, 0, 0, 0],
+        [0, 0, 0, 5],
+        [0, 0, 0, 5],
+        [0, 0, 0, 5],
+    ], 0)
+    right, up = grid.cast_rays([(0, 2)], [(1, 0), (0, -1)])
+    assert right.cells == [(1, 2), (2, 2)] and right.hit == (3, 2)
+    assert up.cells == [(0, 1), (0, 0)] and up.hit is None
+    bounced = grid.cast_rays([(0, 0)], [(1, 1)], bounces=1)[0]
+    assert bounced.cells == [(1, 1), (2, 2), (1, 3)] and bounced.hits == [(3, 3)] and bounced.hit is None
+    grid.draw_line((0, 0), (3, 3), 2, only_background=True)
+    assert grid.data.tolist() == [[2, 0, 0, 0], [0, 2, 0, 5], [0, 0, 2, 5], [0, 0, 0, 5]]
+
+
+def test_flood_fill():
+    grid = Grid([
+        [0, 0, 1, 0],
+        [0, 1, 0, 0],
+        [1, 0, 0, 2],
+        [0, 0, 2, 0],
+    ], 0)
+    filled = grid.copy().flood_fill([(0, 0)], 3)
+    assert filled.sum() == 3
+    assert grid.copy().flood_fill([(0, 0)], 3, go_diagonal=True).sum() == 11
+    assert grid.copy().flood_fill([(3, 0)], 3, stop_colors=[1]).sum() == 10
+    assert grid.flood_fill([(3, 0), (0, 3)], None, region=GridRegion([GridPoint(0, 2), GridPoint(3, 3)])).sum() == 4
+    assert grid.copy().fill_color(GridPoint(0, 0), 3).data.tolist() == [[3, 3, 1, 3], [3, 1, 3, 3], [1, 3, 3, 2], [3, 3, 2, 3]]
+
+
+def test_blit():
+    grid = Grid([
+        [0, 0, 0],
+        [0, 2, 0],
+        [0, 0, 0],
+    ], 0)
+    source = Grid([[1, 0], [1, 1]], 0)
+    placed = grid.blit(source, 1, 1)
+    assert grid.data.tolist() == [[0, 0, 0], [0, 1, 0], [0, 1, 1]]
+    assert placed.region == GridRegion([GridPoint(1, 1), GridPoint(2, 2)]) and placed.data.tolist() == [[1, 0], [1, 1]]
+    grid.blit(source, -1, 0, greedy=False, fill_color=3)
+    assert grid.data.tolist() == [[0, 0, 0], [3, 1, 0], [0, 1, 1]]
+    grid.blit(source, 2, 2, transparent=False, extend=True)
+    assert grid.data.tolist() == [[0, 0, 0, 0], [3, 1, 0, 0], [0, 1, 1, 0], [0, 0, 1, 1]]
+
+
+def test_tracer_records_blit_cells():
+    from arc_tools.logger import tracer
+    grid = Grid([[0, 0], [0, 0]], 0)
+    tracer.enable(8)
+    try:
+        grid.blit(Grid([[5]], 0), 1, 0)
+    finally:
+        tracer.disable()
+    assert tracer.events[-1] == ('blit_cell', {'x': 1, 'y': 0, 'value': 5})
+    tracer.clear()
+
+
+def test_import_stays_light():
+    import subprocess
+    import sys
+    # numpy is loaded first so the budget only covers arc_tools itself
+    script = (
+        "import sys, time; import numpy; start = time.perf_counter(); import arc_tools.grid; "
+        "print(time.perf_counter() - start); print(sorted({m.split('.')[0] for m in sys.modules} & {'matplotlib', 'pyperclip'}))"
+    )
+    elapsed, heavy = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True).stdout.splitlines()
+    assert heavy == '[]'
+    assert float(elapsed) < 0.5
+
 if __name__ == "__main__":
     test_grid_with_hollow()
     test_split_into_square_boxes()
@@ -118,4 +495,3 @@ if __name__ == "__main__":
     test_detect_objects_single_color()
     test_move_object()
     print("All test cases passed")
-
@@ -1,5 +1,6 @@
 from arc_tools.grid import Color, copy_object
 from arc_tools.grid import Grid, GridPoint, GridRegion, SubGrid, detect_objects
+from arc_tools.periodicity import find_tile
 
 # 1 00576224 repeat_reverse_grid
 # 6 017c7c7b repeat_and_swap_color
@@ -13,21 +14,8 @@ def repeat_and_swap_color(grid: Grid) -> Grid:
     result = grid.copy()
     
     # Find the repeated region
-    # height is not fixed, so we need to find the repeated region
-    # take n elements and check next n elements
-    # if they are the same, then we have found the repeated region
-    pattern = None
-    for i in range(1, len(result) + 1):
-        pattern = result[:i]
-        for j in range(i, len(result), len(pattern)):
-            sliced = result[j:j+len(pattern)]
-            if sliced != pattern[:len(sliced)]:
-                break
-        else:
-            break
-    
-    if pattern is None:
-        pattern = result
+    # height is not fixed, so take the smallest row period of the grid
+    pattern = result[:find_tile(result).grid.height]
     # plot_grid(pattern, name="pattern.png",show=1)
     
     # Create a new grid with exactly 3 additional rows